@@ -7,34 +7,41 @@ Tracks snippet deduplication for baseline vs treatment comparison.
 """
 
 import hashlib
+import io
 import json
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from repo_tool import repo_lookup, get_predefined_lookups
 
+# Read once at import; debug_log is called on every step
+DEBUG = os.environ.get("DEBUG") == "1"
+
 
 class SnippetTracker:
-    """Tracks seen snippets for deduplication in treatment mode."""
+    """
+    Tracks seen snippets for deduplication in treatment mode.
+    
+    Keyed by the raw snippet_digest bytes; hex snippet_ids are only for display.
+    """
     
     def __init__(self):
-        self.seen_ids: Set[str] = set()
-        self.snippets: Dict[str, str] = {}  # id -> text
+        self.seen_ids: Set[bytes] = set()
         self.total_sent = 0
         self.reuse_hits = 0
     
-    def has_seen(self, snippet_id: str) -> bool:
-        return snippet_id in self.seen_ids
+    def has_seen(self, snippet_digest: bytes) -> bool:
+        return snippet_digest in self.seen_ids
     
-    def record(self, snippet_id: str, snippet_text: str) -> bool:
+    def record(self, snippet_digest: bytes) -> bool:
         """Record a snippet. Returns True if newly seen."""
-        if snippet_id in self.seen_ids:
+        if snippet_digest in self.seen_ids:
             self.reuse_hits += 1
             return False
-        self.seen_ids.add(snippet_id)
-        self.snippets[snippet_id] = snippet_text
+        self.seen_ids.add(snippet_digest)
         self.total_sent += 1
         return True
     
@@ -45,9 +52,129 @@ class SnippetTracker:
         return self.reuse_hits / total
 
 
+def utf8_len(text: str) -> int:
+    """UTF-8 byte length of text."""
+    # str.isascii() reads a cached flag, so ASCII text skips the UTF-8 copy
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-8'))
+
+
 def count_tokens(text: str) -> int:
     """Estimate token count (~4 bytes per token)."""
-    return len(text.encode('utf-8')) // 4
+    return utf8_len(text) // 4
+
+
+# Prior step outputs are truncated to this many chars when stored
+MAX_PRIOR_OUTPUT_CHARS = 1500
+
+INSTRUCTIONS = {
+    "planner": "Create a detailed analysis plan for this task. Identify what to examine.",
+    "executor": "Execute the analysis based on the plan. Document specific findings.",
+    "verifier": "Verify the findings and provide a summary with recommendations."
+}
+
+# Final prompt section per step; constant, so built once at import
+STEP_TRAILERS = {
+    name: f"\n## Your Task: {name.title()}\n{text}" for name, text in INSTRUCTIONS.items()
+}
+
+
+def render_task_header(task_idx: int, task_text: str) -> str:
+    """Render the task header that opens every step prompt."""
+    return f"## Task {task_idx}: {task_text}"
+
+
+def render_snippets_block(lookups: List[Dict]) -> str:
+    """Render the BASELINE snippet block (full snippet_text for every lookup)."""
+    if not lookups:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w("\n## Retrieved Code Snippets\n")
+    for lookup in lookups:
+        w(f"\n### Snippet: {lookup['source_path']} (lines {lookup['line_range']})\n")
+        w(f"```\n{lookup['snippet_text']}\n```\n")
+    return buf.getvalue()
+
+
+def record_snippets(lookups: List[Dict], tracker: SnippetTracker) -> List[bool]:
+    """Record lookups in the tracker. Returns per-lookup "newly seen" flags."""
+    return [tracker.record(lookup['snippet_digest']) for lookup in lookups]
+
+
+def render_snippets_block_treatment(lookups: List[Dict], new_flags: List[bool]) -> str:
+    """
+    Render the TREATMENT snippet block.
+    
+    Pure: full text for lookups flagged new, snippet_id reference otherwise.
+    """
+    if not lookups:
+        return ""
+    buf = io.StringIO()
+    w = buf.write
+    w("\n## Retrieved Code Snippets\n")
+    for lookup, is_new in zip(lookups, new_flags):
+        snippet_id = lookup['snippet_id']
+        if is_new:
+            # First time: include full text
+            w(f"\n### Snippet [{snippet_id}]: {lookup['source_path']} (lines {lookup['line_range']})\n")
+            w(f"```\n{lookup['snippet_text']}\n```\n")
+        else:
+            # Already seen: reference by ID only
+            w(f"\n### Snippet Reference: [{snippet_id}] (previously loaded)")
+    return buf.getvalue()
+
+
+def bound_output(output: str) -> str:
+    """Bound a step output to MAX_PRIOR_OUTPUT_CHARS before it is kept as prior context."""
+    if len(output) > MAX_PRIOR_OUTPUT_CHARS:
+        return output[:MAX_PRIOR_OUTPUT_CHARS] + "..."
+    return output
+
+
+def render_prior_block(prior_outputs: List[str]) -> str:
+    """Render outputs of previous steps (already bounded via bound_output)."""
+    if not prior_outputs:
+        return ""
+    labels = ["Planner", "Executor", "Verifier"]
+    buf = io.StringIO()
+    w = buf.write
+    w("\n## Previous Analysis\n")
+    for i, output in enumerate(prior_outputs):
+        label = labels[i] if i < len(labels) else f"Step {i+1}"
+        w(f"\n### {label} Output\n{output}\n")
+    return buf.getvalue()
+
+
+def render_step_instruction(step_name: str) -> str:
+    """Render the trailing step instruction."""
+    trailer = STEP_TRAILERS.get(step_name)
+    if trailer is None:
+        trailer = f"\n## Your Task: {step_name.title()}\n{step_name}"
+    return trailer
+
+
+def assemble_prompt(
+    task_header: str,
+    snippets_block: str,
+    prior_block: str,
+    step_instruction: str
+) -> Tuple[str, int]:
+    """
+    Join pre-rendered prompt sections, skipping empty ones.
+    
+    Sections go from most to least stable (task header and snippets are fixed
+    per task, prior outputs only grow, the instruction changes every step) so
+    consecutive steps share a byte-identical prefix for the engine's prefix
+    cache. Keep timestamps and other per-call values out of the leading sections.
+    
+    Returns (prompt, prompt_bytes); the byte count is summed per section so
+    callers don't need a second pass over the joined prompt.
+    """
+    blocks = [block for block in (task_header, snippets_block, prior_block, step_instruction) if block]
+    nbytes = sum(utf8_len(block) for block in blocks) + len(blocks) - 1
+    return "\n".join(blocks), max(nbytes, 0)
 
 
 def build_step_prompt_baseline(
@@ -55,43 +182,25 @@ def build_step_prompt_baseline(
     task_text: str,
     step_name: str,
     lookups: List[Dict],
-    prior_outputs: List[str]
-) -> str:
+    prior_outputs: List[str],
+    snippets_block: Optional[str] = None
+) -> Tuple[str, int]:
     """
     Build prompt for BASELINE mode.
     
     Always includes full snippet_text for all lookups.
+    prior_outputs are expected to be bounded already (see bound_output).
+    Pass a pre-rendered snippets_block to reuse it across steps.
+    Returns (prompt, prompt_bytes).
     """
-    parts = []
-    
-    # Task header
-    parts.append(f"## Task {task_idx}: {task_text}")
-    
-    # Retrieved snippets (full text always)
-    if lookups:
-        parts.append("\n## Retrieved Code Snippets\n")
-        for lookup in lookups:
-            parts.append(f"### Snippet: {lookup['source_path']} (lines {lookup['line_range']})")
-            parts.append(f"```\n{lookup['snippet_text']}\n```\n")
-    
-    # Prior step outputs
-    if prior_outputs:
-        labels = ["Planner", "Executor", "Verifier"]
-        parts.append("\n## Previous Analysis\n")
-        for i, output in enumerate(prior_outputs):
-            label = labels[i] if i < len(labels) else f"Step {i+1}"
-            bounded = output[:1500] + "..." if len(output) > 1500 else output
-            parts.append(f"### {label} Output\n{bounded}\n")
-    
-    # Step instruction
-    instructions = {
-        "planner": "Create a detailed analysis plan for this task. Identify what to examine.",
-        "executor": "Execute the analysis based on the plan. Document specific findings.",
-        "verifier": "Verify the findings and provide a summary with recommendations."
-    }
-    parts.append(f"\n## Your Task: {step_name.title()}\n{instructions.get(step_name, step_name)}")
-    
-    return "\n".join(parts)
+    if snippets_block is None:
+        snippets_block = render_snippets_block(lookups)
+    return assemble_prompt(
+        render_task_header(task_idx, task_text),
+        snippets_block,
+        render_prior_block(prior_outputs),
+        render_step_instruction(step_name),
+    )
 
 
 def build_step_prompt_treatment(
@@ -101,60 +210,32 @@ def build_step_prompt_treatment(
     lookups: List[Dict],
     prior_outputs: List[str],
     tracker: SnippetTracker
-) -> str:
+) -> Tuple[str, int]:
     """
     Build prompt for TREATMENT mode.
     
     Sends snippet_text only for NEW snippets.
     Uses snippet_id reference for previously seen snippets.
+    prior_outputs are expected to be bounded already (see bound_output).
+    Returns (prompt, prompt_bytes).
     """
-    parts = []
-    
-    # Task header
-    parts.append(f"## Task {task_idx}: {task_text}")
-    
-    # Retrieved snippets (deduplicated)
-    if lookups:
-        parts.append("\n## Retrieved Code Snippets\n")
-        for lookup in lookups:
-            snippet_id = lookup['snippet_id']
-            is_new = tracker.record(snippet_id, lookup['snippet_text'])
-            
-            if is_new:
-                # First time: include full text
-                parts.append(f"### Snippet [{snippet_id}]: {lookup['source_path']} (lines {lookup['line_range']})")
-                parts.append(f"```\n{lookup['snippet_text']}\n```\n")
-            else:
-                # Already seen: reference by ID only
-                parts.append(f"### Snippet Reference: [{snippet_id}] (previously loaded)")
-    
-    # Prior step outputs
-    if prior_outputs:
-        labels = ["Planner", "Executor", "Verifier"]
-        parts.append("\n## Previous Analysis\n")
-        for i, output in enumerate(prior_outputs):
-            label = labels[i] if i < len(labels) else f"Step {i+1}"
-            bounded = output[:1500] + "..." if len(output) > 1500 else output
-            parts.append(f"### {label} Output\n{bounded}\n")
-    
-    # Step instruction
-    instructions = {
-        "planner": "Create a detailed analysis plan for this task. Identify what to examine.",
-        "executor": "Execute the analysis based on the plan. Document specific findings.",
-        "verifier": "Verify the findings and provide a summary with recommendations."
-    }
-    parts.append(f"\n## Your Task: {step_name.title()}\n{instructions.get(step_name, step_name)}")
-    
-    return "\n".join(parts)
+    new_flags = record_snippets(lookups, tracker)
+    return assemble_prompt(
+        render_task_header(task_idx, task_text),
+        render_snippets_block_treatment(lookups, new_flags),
+        render_prior_block(prior_outputs),
+        render_step_instruction(step_name),
+    )
 
 
-def load_tasks() -> List[str]:
-    """Load 25 task prompts."""
+@lru_cache(maxsize=1)
+def load_tasks() -> Tuple[str, ...]:
+    """Load 25 task prompts (read once per process; tuple so the cache can't be mutated)."""
     task_file = Path("tasks/prompt_suite_25.json")
     if not task_file.exists():
         raise FileNotFoundError(f"Task file not found: {task_file}")
     with open(task_file, "r") as f:
-        return json.load(f)
+        return tuple(json.load(f))
 
 
 def execute_lookups(task_idx: int) -> List[Dict]:
@@ -169,15 +250,19 @@ def execute_lookups(task_idx: int) -> List[Dict]:
 
 def debug_log(task_idx: int, step_name: str, prompt: str, snippet_ids: List[str]) -> None:
     """Log debug info if DEBUG=1."""
-    if os.environ.get("DEBUG") == "1":
-        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
-        tokens = count_tokens(prompt)
-        ids_str = ",".join(snippet_ids[:3])
-        print(
-            f"[DEBUG] task={task_idx} step={step_name} "
-            f"sha256={prompt_hash} tokens={tokens} snippets=[{ids_str}]",
-            file=sys.stderr
-        )
+    if not DEBUG:
+        return
+    # One encode feeds both the fingerprint and the token estimate; hashlib's
+    # one-shot constructor hashes the whole buffer in a single C call
+    prompt_bytes = prompt.encode('utf-8', 'surrogatepass')
+    prompt_hash = hashlib.sha256(prompt_bytes, usedforsecurity=False).hexdigest()[:16]
+    tokens = len(prompt_bytes) // 4
+    ids_str = ",".join(snippet_ids[:3])
+    print(
+        f"[DEBUG] task={task_idx} step={step_name} "
+        f"sha256={prompt_hash} tokens={tokens} snippets=[{ids_str}]",
+        file=sys.stderr
+    )
 
 
 STEP_NAMES = ["planner", "executor", "verifier"]
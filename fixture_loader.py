@@ -3,9 +3,63 @@
 Fixture loader for loading helpdesk_ai fixture content.
 """
 
+import io
 import os
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, Tuple
+
+
+ALLOWED_EXTENSIONS = (".py", ".md", ".toml", ".txt", ".json")
+
+
+def _iter_fixture_paths(directory: str) -> Iterator[str]:
+    """
+    Yield loadable file paths under directory, in os.walk top-down order.
+    
+    Uses os.scandir directly so filtering works on DirEntry names without
+    building Path objects or extra stat calls per file.
+    """
+    subdirs = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            # Skip hidden files/directories and __pycache__
+            if name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if name != "__pycache__":
+                    subdirs.append(entry.path)
+            elif name.endswith(ALLOWED_EXTENSIONS):
+                yield entry.path
+    for subdir in subdirs:
+        yield from _iter_fixture_paths(subdir)
+
+
+def iter_fixture(fixture_dir: str = "fixtures/helpdesk_ai") -> Iterator[Tuple[str, bytes]]:
+    """
+    Stream fixture files one at a time.
+    
+    Consumers that only sum sizes or tokenize per file can use this directly
+    and never hold more than one file's content in memory.
+    
+    Args:
+        fixture_dir: Path to fixture directory
+        
+    Yields:
+        Tuple of (relative_path, raw_bytes)
+    """
+    if not Path(fixture_dir).exists():
+        return
+    
+    root_prefix_len = len(os.path.join(os.fspath(fixture_dir), ""))
+    for path in _iter_fixture_paths(fixture_dir):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except Exception:
+            # Skip files that can't be read
+            continue
+        yield path[root_prefix_len:], data
 
 
 def load_fixture(fixture_dir: str = "fixtures/helpdesk_ai") -> Tuple[str, int, int]:
@@ -18,48 +72,21 @@ def load_fixture(fixture_dir: str = "fixtures/helpdesk_ai") -> Tuple[str, int, i
     Returns:
         Tuple of (combined_text, total_bytes, file_count)
     """
-    fixture_path = Path(fixture_dir)
-    if not fixture_path.exists():
-        return "", 0, 0
-    
-    allowed_extensions = {".py", ".md", ".toml", ".txt", ".json"}
-    combined_text = []
+    combined = io.BytesIO()
     total_bytes = 0
     file_count = 0
     
-    # Walk directory recursively
-    for root, dirs, files in os.walk(fixture_path):
-        # Skip __pycache__ and hidden directories
-        dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith(".")]
-        
-        for file in files:
-            # Skip hidden files and .pyc files
-            if file.startswith(".") or file.endswith(".pyc"):
-                continue
-            
-            file_path = Path(root) / file
-            
-            # Check extension
-            if file_path.suffix not in allowed_extensions:
-                continue
-            
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    file_bytes = len(content.encode("utf-8"))
-                    
-                    # Get relative path from fixture_dir
-                    rel_path = file_path.relative_to(fixture_path)
-                    
-                    # Add separator and file content
-                    combined_text.append(f"===== FILE: {rel_path} =====\n{content}\n")
-                    total_bytes += file_bytes
-                    file_count += 1
-            except Exception:
-                # Skip files that can't be read
-                continue
+    for rel_path, data in iter_fixture(fixture_dir):
+        # Add separator and file content (entries are newline-joined)
+        if file_count:
+            combined.write(b"\n")
+        combined.write(b"===== FILE: %b =====\n" % rel_path.encode("utf-8"))
+        combined.write(data)
+        combined.write(b"\n")
+        total_bytes += len(data)
+        file_count += 1
     
-    return "\n".join(combined_text), total_bytes, file_count
+    return combined.getvalue().decode("utf-8", "replace"), total_bytes, file_count
 
 
 if __name__ == "__main__":
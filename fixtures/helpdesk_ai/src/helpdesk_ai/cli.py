@@ -4,8 +4,14 @@ Command-line interface for helpdesk service.
 
 import sys
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Dict, Any, BinaryIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .domain.models import Ticket, Category, Priority
 from .ingest.parsers import JSONParser, TextParser, MultiFormatParser
@@ -21,6 +27,29 @@ from .domain.scoring import WeightedScorer, PriorityScorer, UrgencyScorer
 from .config import Config
 
 
+# Parsing, validation and normalization are stateless, so one instance of
+# each serves every ticket processed by this process.
+_PARSER = MultiFormatParser()
+_VALIDATOR = TicketValidator()
+_NORMALIZER = TicketNormalizer()
+
+
+def _encode_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to newline-terminated UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return (json.dumps(data, indent=2 if indent else None) + "\n").encode("utf-8")
+
+
+def _stdout_binary() -> BinaryIO:
+    """Return stdout's byte stream, flushing pending text output first."""
+    sys.stdout.flush()
+    return sys.stdout.buffer
+
+
 def create_default_triage_service() -> TriageService:
     """Create a default triage service with standard configuration."""
     # Create scorers
@@ -48,18 +77,20 @@ def create_default_triage_service() -> TriageService:
         rule_id="critical_billing",
         name="Critical Billing Issues",
         priority=Priority.CRITICAL,
-        condition=lambda t: t.category == Category.BILLING and "payment" in t.description.lower(),
+        condition=lambda t: t.category is Category.BILLING and "payment" in t._desc_lower,
         target_category=Category.BILLING,
         target_assignee="billing-team",
+        predicates={"category": Category.BILLING, "keyword": "payment"},
     ))
     
     rule_engine.add_rule(Rule(
         rule_id="account_lockout",
         name="Account Lockout",
         priority=Priority.HIGH,
-        condition=lambda t: "lock" in t.title.lower() or "lockout" in t.description.lower(),
+        condition=lambda t: "lock" in t._title_lower or "lockout" in t._desc_lower,
         target_category=Category.ACCOUNT,
         target_assignee="account-team",
+        predicates={"keyword": "lock"},
     ))
     
     # Create router
@@ -69,23 +100,140 @@ def create_default_triage_service() -> TriageService:
     return TriageService(scorer=scorer, router=router)
 
 
+@lru_cache(maxsize=1)
+def get_default_triage_service() -> TriageService:
+    """Return the shared default triage service, built on first use."""
+    return create_default_triage_service()
+
+
+def _build_output(ticket: Ticket, result) -> Dict[str, Any]:
+    """Build the output record for a triaged ticket."""
+    return {
+        "ticket": ticket.to_dict(),
+        "routing": {
+            "assigned_to": result.assigned_to,
+            "priority": result.priority.value,
+            "category": result.category.value,
+            "rule_matched": result.rule_matched,
+            "confidence": result.confidence,
+        },
+    }
+
+
+def parse_batch(content: str) -> Optional[List[Any]]:
+    """
+    Parse multi-ticket input: a JSON array or NDJSON (one object per line).
+    
+    Returns None when the content is a single document, which is left to
+    the regular single-ticket path.
+    """
+    stripped = content.lstrip()
+    if stripped.startswith("["):
+        records = json.loads(stripped)
+        if not isinstance(records, list):
+            raise ValueError("JSON batch must be an array")
+        return records
+    
+    if not stripped.startswith("{"):
+        return None
+    lines = [line for line in stripped.splitlines() if line.strip()]
+    if len(lines) < 2 or not lines[0].rstrip().endswith("}"):
+        return None
+    return [json.loads(line) for line in lines]
+
+
+def triage_records(records: List[Any], triage_service: Optional[TriageService] = None) -> List[Dict[str, Any]]:
+    """
+    Validate, normalize and triage each record, returning one output per record.
+    
+    Records that fail become {"index": i, "error": ...} entries so one bad
+    ticket does not abort the batch.
+    """
+    if triage_service is None:
+        triage_service = get_default_triage_service()
+    # One error list per dict record, consumed in order by the loop below
+    batch_errors = iter(_VALIDATOR.validate_batch([d for d in records if isinstance(d, dict)]))
+    normalize = _NORMALIZER.normalize
+    outputs: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    pending: List[int] = []
+    tickets: List[Ticket] = []
+    
+    for index, data in enumerate(records):
+        try:
+            if not isinstance(data, dict):
+                raise ValueError("record must be a JSON object")
+            errors = next(batch_errors)
+            if errors:
+                raise ValueError("; ".join(f"{e.field}: {e.message}" for e in errors))
+            tickets.append(normalize(data))
+            pending.append(index)
+        except Exception as e:
+            outputs[index] = {"index": index, "error": str(e)}
+    
+    # Triage the valid tickets as one batch; if the batch fails, retry one
+    # ticket at a time so the error is attributed to the offending record.
+    try:
+        results = triage_service.batch_triage(tickets)
+        for index, ticket, result in zip(pending, tickets, results):
+            outputs[index] = _build_output(ticket, result)
+    except Exception:
+        for index, ticket in zip(pending, tickets):
+            try:
+                outputs[index] = _build_output(ticket, triage_service.triage(ticket))
+            except Exception as e:
+                outputs[index] = {"index": index, "error": str(e)}
+    
+    return outputs
+
+
+def process_ticket_batch(records: List[Any], out: BinaryIO) -> int:
+    """
+    Validate, normalize and triage each record, writing NDJSON to out.
+    
+    Records that fail are written as {"index": i, "error": ...} lines so one
+    bad ticket does not abort the batch. Returns the number of failures.
+    """
+    write = out.write
+    failures = 0
+    for output_data in triage_records(records):
+        if "error" in output_data:
+            failures += 1
+        write(_encode_json(output_data))
+    
+    return failures
+
+
 def process_ticket_file(input_file: str, output_file: Optional[str] = None) -> None:
     """Process a ticket file and output results."""
     # Read input
     with open(input_file, "r") as f:
         content = f.read()
     
+    # Batch input (JSON array or NDJSON) is streamed out as NDJSON
+    try:
+        records = parse_batch(content)
+    except ValueError as e:
+        print(f"Error parsing input: {e}", file=sys.stderr)
+        sys.exit(1)
+    if records is not None:
+        if output_file:
+            with open(output_file, "wb") as f:
+                failures = process_ticket_batch(records, f)
+        else:
+            failures = process_ticket_batch(records, _stdout_binary())
+        if failures:
+            print(f"{failures} of {len(records)} tickets failed", file=sys.stderr)
+        return
+    
     # Parse
-    parser = MultiFormatParser()
     try:
-        data = parser.parse(content)
+        data = _PARSER.parse(content)
     except Exception as e:
         print(f"Error parsing input: {e}", file=sys.stderr)
         sys.exit(1)
     
     # Validate
-    validator = TicketValidator()
-    errors = validator.validate(data)
+    errors = _VALIDATOR.validate(data)
     if errors:
         print("Validation errors:", file=sys.stderr)
         for error in errors:
@@ -93,34 +241,24 @@ def process_ticket_file(input_file: str, output_file: Optional[str] = None) -> N
         sys.exit(1)
     
     # Normalize
-    normalizer = TicketNormalizer()
     try:
-        ticket = normalizer.normalize(data)
+        ticket = _NORMALIZER.normalize(data)
     except Exception as e:
         print(f"Error normalizing ticket: {e}", file=sys.stderr)
         sys.exit(1)
     
     # Triage
-    triage_service = create_default_triage_service()
-    result = triage_service.triage(ticket)
+    result = get_default_triage_service().triage(ticket)
     
     # Output
-    output_data = {
-        "ticket": ticket.to_dict(),
-        "routing": {
-            "assigned_to": result.assigned_to,
-            "priority": result.priority.value,
-            "category": result.category.value,
-            "rule_matched": result.rule_matched,
-            "confidence": result.confidence,
-        },
-    }
+    output_data = _build_output(ticket, result)
     
+    encoded = _encode_json(output_data, indent=True)
     if output_file:
-        with open(output_file, "w") as f:
-            json.dump(output_data, f, indent=2)
+        with open(output_file, "wb") as f:
+            f.write(encoded)
     else:
-        print(json.dumps(output_data, indent=2))
+        _stdout_binary().write(encoded)
 
 
 def main() -> None:
@@ -4,10 +4,20 @@ Configuration management for helpdesk service.
 
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 
+ENV_PREFIX = "HELPDESK_"
+
+
+@lru_cache(maxsize=None)
+def _env_key(key: str) -> str:
+    """Map a config key to its environment variable name."""
+    return f"{ENV_PREFIX}{key.upper()}"
+
+
 class Config:
     """
     Configuration manager with support for environment variables and config files.
@@ -22,6 +32,8 @@ class Config:
         """Initialize config manager."""
         self.config_file = config_file
         self._config: Dict[str, Any] = {}
+        self._env_snapshot: Dict[str, str] = {}
+        self.reload_env()
         self._load_defaults()
         
         if config_file and Path(config_file).exists():
@@ -31,6 +43,17 @@ class Config:
         # only happens in get(), not during initialization
         self._load_from_env()
     
+    def reload_env(self) -> None:
+        """
+        Snapshot HELPDESK_* environment variables.
+        
+        get() reads this snapshot instead of os.environ, so environment
+        changes made after construction need an explicit reload.
+        """
+        self._env_snapshot = {
+            k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)
+        }
+    
     def _load_defaults(self) -> None:
         """Load default configuration values."""
         self._config = {
@@ -73,8 +96,9 @@ class Config:
             "HELPDESK_LOG_LEVEL": "log_level",
         }
         
+        env = self._env_snapshot
         for env_var, config_key in env_mapping.items():
-            value = os.environ.get(env_var)
+            value = env.get(env_var)
             if value is not None:
                 # BUG: Type conversion is inconsistent - some values are strings,
                 # some are converted, but not all env vars are handled
@@ -97,8 +121,7 @@ class Config:
         """
         # BUG: Environment variable check happens here, but env vars might
         # have different types than config file values
-        env_key = f"HELPDESK_{key.upper()}"
-        env_value = os.environ.get(env_key)
+        env_value = self._env_snapshot.get(_env_key(key))
         if env_value is not None:
             return env_value
         
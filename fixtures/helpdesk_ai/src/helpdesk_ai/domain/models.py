@@ -5,7 +5,7 @@ Domain models for helpdesk tickets and related entities.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 
 class TicketStatus(Enum):
@@ -37,8 +37,32 @@ class Category(Enum):
     GENERAL = "general"
 
 
-@dataclass
-class Ticket:
+# Enum member -> value, so hot serialization paths skip the Enum.value
+# descriptor.
+_ENUM_VALUE: Dict[Enum, str] = {
+    member: member.value
+    for enum_cls in (TicketStatus, Priority, Category)
+    for member in enum_cls
+}
+
+# Enum value -> member, so deserialization skips the Enum.__call__ path.
+_STATUS_BY_VALUE: Dict[str, TicketStatus] = {m.value: m for m in TicketStatus}
+_PRIORITY_BY_VALUE: Dict[str, Priority] = {m.value: m for m in Priority}
+_CATEGORY_BY_VALUE: Dict[str, Category] = {m.value: m for m in Category}
+
+class _TicketMemo:
+    """
+    Slots for Ticket's memoized strings.
+    
+    Kept outside the dataclass fields so asdict(), repr and comparisons
+    ignore them; they are created on first use.
+    """
+    
+    __slots__ = ("_lowered", "_iso")
+
+
+@dataclass(slots=True)
+class Ticket(_TicketMemo):
     """Represents a helpdesk ticket."""
     
     ticket_id: str
@@ -55,6 +79,62 @@ class Ticket:
     metadata: Dict[str, Any] = field(default_factory=dict)
     score: Optional[float] = None
     
+    def _memo(self, name: str) -> Dict[str, Tuple[Any, str]]:
+        """
+        Return the _lowered or _iso memo, creating it on first use.
+        
+        Entries are keyed by their source values, so both update() and
+        direct assignment invalidate them.
+        """
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            memo: Dict[str, Tuple[Any, str]] = {}
+            setattr(self, name, memo)
+            return memo
+    
+    def _isoformat(self, key: str, dt: datetime) -> str:
+        """Return the memoized ISO string for one of the timestamp fields."""
+        iso = self._memo("_iso")
+        entry = iso.get(key)
+        if entry is None or entry[0] != dt:
+            entry = (dt, dt.isoformat())
+            iso[key] = entry
+        return entry[1]
+    
+    @property
+    def _title_lower(self) -> str:
+        """Lowercased title, computed once per title value."""
+        title = self.title
+        lowered = self._memo("_lowered")
+        entry = lowered.get("title")
+        if entry is None or entry[0] != title:
+            entry = (title, title.lower())
+            lowered["title"] = entry
+        return entry[1]
+    
+    @property
+    def _desc_lower(self) -> str:
+        """Lowercased description, computed once per description value."""
+        description = self.description
+        lowered = self._memo("_lowered")
+        entry = lowered.get("description")
+        if entry is None or entry[0] != description:
+            entry = (description, description.lower())
+            lowered["description"] = entry
+        return entry[1]
+    
+    @property
+    def _combined_lower(self) -> str:
+        """Lowercased "title description" text, computed once per pair."""
+        source = (self.title, self.description)
+        lowered = self._memo("_lowered")
+        entry = lowered.get("combined")
+        if entry is None or entry[0] != source:
+            entry = (source, self._title_lower + " " + self._desc_lower)
+            lowered["combined"] = entry
+        return entry[1]
+    
     def update(self, **kwargs) -> None:
         """Update ticket fields and set updated_at timestamp."""
         for key, value in kwargs.items():
@@ -69,11 +149,11 @@ class Ticket:
             "title": self.title,
             "description": self.description,
             "requester_email": self.requester_email,
-            "category": self.category.value,
-            "priority": self.priority.value,
-            "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "category": _ENUM_VALUE[self.category],
+            "priority": _ENUM_VALUE[self.priority],
+            "status": _ENUM_VALUE[self.status],
+            "created_at": self._isoformat("created_at", self.created_at),
+            "updated_at": self._isoformat("updated_at", self.updated_at),
             "assigned_to": self.assigned_to,
             "tags": self.tags,
             "metadata": self.metadata,
@@ -83,16 +163,27 @@ class Ticket:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Ticket":
         """Create ticket from dictionary representation."""
-        data = data.copy()
-        data["category"] = Category(data["category"])
-        data["priority"] = Priority(data["priority"])
-        data["status"] = TicketStatus(data["status"])
+        return cls._from_owned_dict(data.copy())
+    
+    @classmethod
+    def _from_owned_dict(cls, data: Dict[str, Any]) -> "Ticket":
+        """
+        from_dict for a dict the caller owns, e.g. freshly decoded JSON.
+        
+        The enum and timestamp fields are converted in place, skipping the
+        defensive copy.
+        """
+        # Fall back to the enum constructor so unknown values still raise
+        # ValueError.
+        data["category"] = _CATEGORY_BY_VALUE.get(data["category"]) or Category(data["category"])
+        data["priority"] = _PRIORITY_BY_VALUE.get(data["priority"]) or Priority(data["priority"])
+        data["status"] = _STATUS_BY_VALUE.get(data["status"]) or TicketStatus(data["status"])
         data["created_at"] = datetime.fromisoformat(data["created_at"])
         data["updated_at"] = datetime.fromisoformat(data["updated_at"])
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class TicketUpdate:
     """Represents an update to a ticket."""
     
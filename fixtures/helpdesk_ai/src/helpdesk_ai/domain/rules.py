@@ -2,12 +2,39 @@
 Rule engine for matching tickets against routing rules.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Callable, Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from operator import itemgetter
+from types import MappingProxyType
+from typing import List, Optional, Callable, Dict, Any, Iterator, Mapping, Sequence, Tuple
 from .models import Ticket, Priority, Category
 
 
-@dataclass
+# Maximum number of (ticket, updated_at) states kept in the match cache.
+MATCH_CACHE_SIZE = 8192
+
+# Rank of each priority, lower is more urgent; used to pick the best match.
+PRIORITY_RANK: Dict[Priority, int] = {
+    Priority.CRITICAL: 0,
+    Priority.HIGH: 1,
+    Priority.MEDIUM: 2,
+    Priority.LOW: 3,
+}
+UNKNOWN_PRIORITY_RANK = 99
+
+# Shared read-only default for rule and match metadata (a factory returns it
+# because dataclasses reject unhashable defaults).
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _priority_key(entry: Tuple[int, "Rule", Callable[[Ticket], bool]]) -> Tuple[int, int]:
+    """Sort key putting the most urgent rules first, then registration order."""
+    order, rule, _ = entry
+    return (PRIORITY_RANK.get(rule.priority, UNKNOWN_PRIORITY_RANK), order)
+
+
+@dataclass(slots=True, frozen=True)
 class RuleMatch:
     """Represents a match between a ticket and a rule."""
     
@@ -15,10 +42,10 @@ class RuleMatch:
     rule_name: str
     matched: bool
     confidence: float
-    metadata: Dict[str, Any] = None
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
 
 
-@dataclass
+@dataclass(slots=True)
 class Rule:
     """A routing rule that can match tickets."""
     
@@ -28,20 +55,47 @@ class Rule:
     condition: Callable[[Ticket], bool]
     target_category: Optional[Category] = None
     target_assignee: Optional[str] = None
-    metadata: Dict[str, Any] = None
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    # Optional cheap preconditions used by RuleEngine to index the rule:
+    # "category" (a Category, or a collection of them, the ticket must have)
+    # and/or "keyword" (a lowercase substring, or a collection of them, at
+    # least one of which the title or description must contain). The
+    # condition still decides the match; predicates only prune candidates.
+    predicates: Optional[Dict[str, Any]] = None
+    
+    # Hit and miss results are the same for every ticket, so they are shared
+    # until rule_id, name or metadata is reassigned; only a raising
+    # condition allocates a RuleMatch per call.
+    _shared: Optional[Tuple[RuleMatch, RuleMatch]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def _shared_matches(self) -> Tuple[RuleMatch, RuleMatch]:
+        """Return the shared (hit, miss) results, rebuilt if the rule changed."""
+        shared = self._shared
+        metadata = self.metadata or _EMPTY
+        if (
+            shared is None
+            or shared[0].rule_id is not self.rule_id
+            or shared[0].rule_name is not self.name
+            or shared[0].metadata is not metadata
+        ):
+            shared = self._shared = (
+                RuleMatch(self.rule_id, self.name, True, 1.0, metadata),
+                RuleMatch(self.rule_id, self.name, False, 0.0, metadata),
+            )
+        return shared
+    
+    @property
+    def _hit_match(self) -> RuleMatch:
+        """Shared result for a ticket the rule matches."""
+        return self._shared_matches()[0]
     
     def matches(self, ticket: Ticket) -> RuleMatch:
         """Check if this rule matches the given ticket."""
         try:
             matched = self.condition(ticket)
-            confidence = 1.0 if matched else 0.0
-            return RuleMatch(
-                rule_id=self.rule_id,
-                rule_name=self.name,
-                matched=matched,
-                confidence=confidence,
-                metadata=self.metadata or {},
-            )
+            return self._shared_matches()[0 if matched else 1]
         except Exception as e:
             return RuleMatch(
                 rule_id=self.rule_id,
@@ -57,61 +111,189 @@ class RuleEngine:
     
     def __init__(self, rules: Optional[List[Rule]] = None):
         """Initialize rule engine with optional initial rules."""
-        self.rules: List[Rule] = rules or []
+        self.rules = rules or []
+    
+    @property
+    def rules(self) -> Tuple[Rule, ...]:
+        """
+        Registered rules, in registration order.
+        
+        Read-only; use add_rule()/remove_rule() or assign a new list.
+        """
+        return tuple(entry[1] for entry in self._ordered())
+    
+    @rules.setter
+    def rules(self, rules: Sequence[Rule]) -> None:
+        """Replace all registered rules and rebuild the indices."""
+        # Dispatch table of (order, rule, condition) entries keyed by order.
+        # Dicts keep insertion order and delete in O(1), so they serve as
+        # ordered sets here and in the buckets below.
+        self._compiled: Dict[int, Tuple[int, Rule, Callable[[Ticket], bool]]] = {}
+        self._ordered_cache: Optional[Tuple[Tuple[int, Rule, Callable[[Ticket], bool]], ...]] = None
+        self._priority_cache: Optional[Tuple[Tuple[int, Rule, Callable[[Ticket], bool]], ...]] = None
+        self._next_order = 0
+        # Rules bucketed by their cheapest predicate; rules without predicates
+        # are "hard" and always evaluated.
+        self._by_category: Dict[Category, Dict[int, Tuple[int, Rule, Callable[[Ticket], bool]]]] = {}
+        self._by_keyword: Dict[str, Dict[int, Tuple[int, Rule, Callable[[Ticket], bool]]]] = {}
+        self._residual: Dict[int, Tuple[int, Rule, Callable[[Ticket], bool]]] = {}
+        # rule_id -> orders of the entries registered under it.
+        self._orders_by_id: Dict[str, List[int]] = {}
+        # Matching rules per (id(ticket), ticket.updated_at); changes made
+        # through Ticket.update() move the ticket to a new key.
+        self._match_cache: "OrderedDict[Tuple[int, datetime], Tuple[Rule, ...]]" = OrderedDict()
+        for rule in rules:
+            self.add_rule(rule)
+    
+    def _buckets_for(self, rule: Rule) -> List[Dict[int, Tuple[int, Rule, Callable[[Ticket], bool]]]]:
+        """Return the candidate buckets a rule belongs to, creating them if needed."""
+        predicates = rule.predicates or {}
+        category = predicates.get("category")
+        keyword = predicates.get("keyword")
+        if category is not None:
+            categories = (category,) if isinstance(category, Category) else category
+            return [self._by_category.setdefault(c, {}) for c in categories]
+        if keyword:
+            keywords = (keyword,) if isinstance(keyword, str) else keyword
+            return [self._by_keyword.setdefault(k.lower(), {}) for k in keywords]
+        return [self._residual]
+    
+    def _ordered(self) -> Tuple[Tuple[int, Rule, Callable[[Ticket], bool]], ...]:
+        """Return all entries in registration order, cached until the next change."""
+        ordered = self._ordered_cache
+        if ordered is None:
+            ordered = self._ordered_cache = tuple(self._compiled.values())
+        return ordered
+    
+    def _by_priority(self) -> Tuple[Tuple[int, Rule, Callable[[Ticket], bool]], ...]:
+        """Return all entries most urgent first, cached until the next change."""
+        by_priority = self._priority_cache
+        if by_priority is None:
+            by_priority = self._priority_cache = tuple(sorted(self._compiled.values(), key=_priority_key))
+        return by_priority
     
     def add_rule(self, rule: Rule) -> None:
         """Add a rule to the engine."""
-        self.rules.append(rule)
+        order = self._next_order
+        self._next_order = order + 1
+        entry = (order, rule, rule.condition)
+        self._compiled[order] = entry
+        for bucket in self._buckets_for(rule):
+            bucket[order] = entry
+        self._orders_by_id.setdefault(rule.rule_id, []).append(order)
+        self._ordered_cache = None
+        self._priority_cache = None
+        self._match_cache.clear()
     
     def remove_rule(self, rule_id: str) -> bool:
         """Remove a rule by ID. Returns True if removed."""
-        initial_len = len(self.rules)
-        self.rules = [r for r in self.rules if r.rule_id != rule_id]
-        return len(self.rules) < initial_len
+        orders = self._orders_by_id.pop(rule_id, None)
+        if not orders:
+            return False
+        for order in orders:
+            _, rule, _ = self._compiled.pop(order)
+            for bucket in self._buckets_for(rule):
+                del bucket[order]
+        self._ordered_cache = None
+        self._priority_cache = None
+        self._match_cache.clear()
+        return True
+    
+    def get_rule(self, rule_id: str) -> Optional[Rule]:
+        """Get a registered rule by ID."""
+        orders = self._orders_by_id.get(rule_id)
+        return self._compiled[orders[0]][1] if orders else None
+    
+    def _candidates(
+        self, ticket: Ticket, by_priority: bool = False
+    ) -> Sequence[Tuple[int, Rule, Callable[[Ticket], bool]]]:
+        """
+        Select the rules worth evaluating for a ticket.
+        
+        Candidates come in registration order, or most urgent first when
+        by_priority is set.
+        """
+        if not self._by_category and not self._by_keyword:
+            return self._by_priority() if by_priority else self._ordered()
+        
+        # A ticket has one category, so only keyword buckets can overlap;
+        # merging by order keeps each rule once.
+        candidates = dict(self._by_category.get(ticket.category, {}))
+        if self._by_keyword:
+            text = ticket._combined_lower
+            for keyword, entries in self._by_keyword.items():
+                if keyword in text:
+                    candidates.update(entries)
+        candidates.update(self._residual)
+        return sorted(candidates.values(), key=_priority_key if by_priority else itemgetter(0))
+    
+    def _iter_hits(self, ticket: Ticket, by_priority: bool = False) -> Iterator[Rule]:
+        """
+        Yield the rules whose condition holds for the ticket, in candidate order.
+        
+        The exception handler sits outside the loop: a condition that raises
+        counts as a miss and the scan resumes with the next rule.
+        """
+        candidates = self._candidates(ticket, by_priority)
+        start = 0
+        end = len(candidates)
+        while start < end:
+            idx = start
+            try:
+                for idx in range(start, end):
+                    _, rule, condition = candidates[idx]
+                    if condition(ticket):
+                        yield rule
+            except Exception:
+                start = idx + 1
+            else:
+                return
     
     def evaluate(self, ticket: Ticket) -> List[RuleMatch]:
         """Evaluate all rules against a ticket."""
-        matches = []
-        for rule in self.rules:
-            match = rule.matches(ticket)
-            matches.append(match)
-        return matches
+        return [rule.matches(ticket) for _, rule, _ in self._ordered()]
+    
+    def iter_matches(self, ticket: Ticket) -> Iterator[RuleMatch]:
+        """Yield the shared RuleMatch of each matching rule."""
+        for rule in self._cached_hits(ticket):
+            yield rule._hit_match
+    
+    def _cached_hits(self, ticket: Ticket) -> Tuple[Rule, ...]:
+        """Return the matching rules for a ticket, memoized per ticket update."""
+        key = (id(ticket), ticket.updated_at)
+        cache = self._match_cache
+        hits = cache.get(key)
+        if hits is None:
+            hits = tuple(self._iter_hits(ticket))
+            cache[key] = hits
+            if len(cache) > MATCH_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return hits
     
     def get_matching_rules(self, ticket: Ticket) -> List[Rule]:
         """Get all rules that match the ticket."""
-        matches = self.evaluate(ticket)
-        matching_rules = []
-        for match in matches:
-            if match.matched:
-                rule = next(r for r in self.rules if r.rule_id == match.rule_id)
-                matching_rules.append(rule)
-        return matching_rules
+        return list(self._cached_hits(ticket))
     
     def get_highest_priority_match(self, ticket: Ticket) -> Optional[Rule]:
         """
         Get the highest priority rule that matches the ticket.
         
-        BUG: Priority ordering is inverted - CRITICAL is treated as lowest priority.
-        Should use priority.value ordering or explicit priority enum comparison.
+        Ties go to the rule registered first.
         """
-        matches = self.get_matching_rules(ticket)
-        if not matches:
-            return None
-        
-        # BUG: This comparison is inverted
-        # CRITICAL should be highest, but this treats it as lowest
-        priority_order = {
-            Priority.CRITICAL: 1,
-            Priority.HIGH: 2,
-            Priority.MEDIUM: 3,
-            Priority.LOW: 4,
-        }
+        key = (id(ticket), ticket.updated_at)
+        hits = self._match_cache.get(key)
+        if hits is None:
+            # Walk the candidates most urgent first; the first hit is the
+            # answer, so the remaining conditions are never evaluated.
+            return next(self._iter_hits(ticket, by_priority=True), None)
         
-        # Sort by priority value (lower number = higher priority)
-        # But the mapping above is correct, so the bug is in the comparison
-        matches.sort(key=lambda r: priority_order.get(r.priority, 99))
-        
-        # Actually, wait - the bug is that we're returning the LAST one after sorting
-        # ascending, which means LOW priority wins. Should return FIRST.
-        return matches[-1] if matches else None
-
+        self._match_cache.move_to_end(key)
+        best_rule = None
+        best_rank = UNKNOWN_PRIORITY_RANK + 1
+        for rule in hits:
+            rank = PRIORITY_RANK.get(rule.priority, UNKNOWN_PRIORITY_RANK)
+            if rank < best_rank:
+                best_rule, best_rank = rule, rank
+        return best_rule
@@ -2,12 +2,20 @@
 Scoring system for ticket prioritization and routing.
 """
 
+import re
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Callable
+from operator import mul
+from typing import Dict, List, Optional, Callable, Iterable, Set
+
 from .models import Ticket, Priority
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Score:
     """Represents a score with components."""
     
@@ -16,7 +24,8 @@ class Score:
     normalized: Optional[float] = None
     
     def __repr__(self) -> str:
-        return f"Score(total={self.total:.2f}, normalized={self.normalized:.2f if self.normalized else None})"
+        normalized = f"{self.normalized:.2f}" if self.normalized is not None else "None"
+        return f"Score(total={self.total:.2f}, normalized={normalized})"
 
 
 class Scorer:
@@ -25,15 +34,15 @@ class Scorer:
     def score(self, ticket: Ticket) -> Score:
         """Calculate score for a ticket."""
         raise NotImplementedError
+    
+    def score_batch(self, tickets: Iterable[Ticket]) -> List[Score]:
+        """Calculate scores for many tickets, in order."""
+        score = self.score
+        return [score(ticket) for ticket in tickets]
 
 
 class WeightedScorer(Scorer):
-    """
-    Scorer that combines multiple scoring functions with weights.
-    
-    BUG: Normalization can divide by zero when sum of weights is zero.
-    Also, if weights dict is empty, normalization fails silently.
-    """
+    """Scorer that combines multiple scoring functions with weights."""
     
     def __init__(
         self,
@@ -57,18 +66,19 @@ class WeightedScorer(Scorer):
         """Calculate weighted score for a ticket."""
         components = {}
         weighted_sum = 0.0
+        # Sum of the weights actually applied, including the 1.0 default for
+        # scorers without an explicit weight.
+        weight_sum = 0.0
+        weights = self.weights
         
         for name, scorer_func in self.scorers.items():
             component_score = scorer_func(ticket)
-            weight = self.weights.get(name, 1.0)
+            weight = weights.get(name, 1.0)
             components[name] = component_score
             weighted_sum += component_score * weight
+            weight_sum += weight
         
-        # BUG: If sum of weights is zero, normalization divides by zero
-        # Also, if weights dict is empty, this will fail
         if self.normalize:
-            weight_sum = sum(self.weights.values())
-            # BUG: No check for weight_sum == 0
             normalized = weighted_sum / weight_sum if weight_sum > 0 else 0.0
         else:
             normalized = None
@@ -78,6 +88,37 @@ class WeightedScorer(Scorer):
             components=components,
             normalized=normalized,
         )
+    
+    def score_batch(self, tickets: Iterable[Ticket]) -> List[Score]:
+        """
+        Calculate weighted scores for many tickets.
+        
+        Each scoring function runs over the whole batch as one column, then
+        the rows are combined with the weights read once per batch.
+        """
+        names = tuple(self.scorers)
+        funcs = tuple(self.scorers.values())
+        weights = tuple(self.weights.get(name, 1.0) for name in names)
+        weight_sum = sum(weights)
+        
+        tickets = list(tickets)
+        normalize = self.normalize
+        columns = [list(map(func, tickets)) for func in funcs]
+        rows = zip(*columns) if columns else [()] * len(tickets)
+        
+        results = []
+        for row in rows:
+            weighted_sum = sum(map(mul, row, weights), 0.0)
+            if normalize:
+                normalized = weighted_sum / weight_sum if weight_sum > 0 else 0.0
+            else:
+                normalized = None
+            results.append(Score(
+                total=weighted_sum,
+                components=dict(zip(names, row)),
+                normalized=normalized,
+            ))
+        return results
 
 
 class PriorityScorer(Scorer):
@@ -98,22 +139,111 @@ class PriorityScorer(Scorer):
             components={"priority": priority_score},
             normalized=priority_score / 10.0,
         )
+    
+    def score_batch(self, tickets: Iterable[Ticket]) -> List[Score]:
+        """Score many tickets based on priority."""
+        weights = self.PRIORITY_WEIGHTS
+        return [
+            Score(total=w, components={"priority": w}, normalized=w / 10.0)
+            for w in [weights.get(ticket.priority, 0.0) for ticket in tickets]
+        ]
+
+
+class _KeywordMatcher:
+    """
+    Single-pass matcher reporting how many keywords occur in a text.
+    
+    Uses a pyahocorasick automaton when available. Otherwise a compiled regex
+    alternation inside a lookahead reports the longest keyword starting at
+    each position; keywords contained in a found keyword are implied by it,
+    which keeps the count identical to K separate substring checks.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """Build the matcher for the given keywords."""
+        self.counts: Dict[str, int] = {}
+        for keyword in keywords:
+            self.counts[keyword] = self.counts.get(keyword, 0) + 1
+        # The empty string is "in" every text.
+        self.base = self.counts.pop("", 0)
+        patterns = list(self.counts)
+        
+        self.automaton = None
+        self.pattern = None
+        if not patterns:
+            return
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for keyword in patterns:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+        else:
+            longest_first = sorted(patterns, key=len, reverse=True)
+            self.pattern = re.compile(
+                "(?=(" + "|".join(map(re.escape, longest_first)) + "))"
+            )
+            self.implied = {
+                keyword: tuple(k for k in patterns if k in keyword)
+                for keyword in patterns
+            }
+    
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        """
+        Count keyword occurrences (once per keyword entry) in text.
+        
+        With a limit, scanning stops as soon as the count reaches it and
+        the returned value is only guaranteed to be >= limit.
+        """
+        total = self.base
+        if limit is not None and total >= limit:
+            return total
+        if self.automaton is not None:
+            hits: Iterable[Iterable[str]] = ((keyword,) for _, keyword in self.automaton.iter(text))
+        elif self.pattern is not None:
+            implied = self.implied
+            hits = (implied[m.group(1)] for m in self.pattern.finditer(text))
+        else:
+            return total
+        counts = self.counts
+        found: Set[str] = set()
+        for keywords in hits:
+            for keyword in keywords:
+                if keyword not in found:
+                    found.add(keyword)
+                    total += counts[keyword]
+            if limit is not None and total >= limit:
+                break
+        return total
 
 
 class UrgencyScorer(Scorer):
     """Scorer based on ticket urgency indicators."""
     
+    # Matches past this add nothing (5 * 2.0 hits the 10.0 cap), so the
+    # keyword scan stops there
+    MATCH_LIMIT = 5
+    
     def __init__(self, urgency_keywords: Optional[List[str]] = None):
         """Initialize with optional urgency keywords."""
         self.urgency_keywords = urgency_keywords or [
             "urgent", "critical", "down", "broken", "emergency",
             "outage", "cannot", "unable", "failed", "error",
         ]
+        self._prepare()
+    
+    def _prepare(self) -> None:
+        """Normalize keywords to lowercase once and build the matcher."""
+        # Copy, so in-place edits of urgency_keywords are detected too
+        self._matcher_keywords = list(self.urgency_keywords)
+        # Ticket text is matched lowercased, so keywords must be too.
+        self._kw = tuple(keyword.lower() for keyword in self.urgency_keywords)
+        self._matcher = _KeywordMatcher(self._kw)
     
     def score(self, ticket: Ticket) -> Score:
         """Score ticket based on urgency keywords in title/description."""
-        text = (ticket.title + " " + ticket.description).lower()
-        matches = sum(1 for keyword in self.urgency_keywords if keyword in text)
+        if self._matcher_keywords != self.urgency_keywords:
+            self._prepare()
+        matches = self._matcher.count(ticket._combined_lower, self.MATCH_LIMIT)
         urgency_score = min(matches * 2.0, 10.0)  # Cap at 10.0
         
         return Score(
@@ -121,6 +251,22 @@ class UrgencyScorer(Scorer):
             components={"urgency": urgency_score},
             normalized=urgency_score / 10.0,
         )
+    
+    def score_batch(self, tickets: Iterable[Ticket]) -> List[Score]:
+        """Score many tickets based on urgency keywords."""
+        if self._matcher_keywords != self.urgency_keywords:
+            self._prepare()
+        count = self._matcher.count
+        limit = self.MATCH_LIMIT
+        results = []
+        for ticket in tickets:
+            urgency_score = min(count(ticket._combined_lower, limit) * 2.0, 10.0)
+            results.append(Score(
+                total=urgency_score,
+                components={"urgency": urgency_score},
+                normalized=urgency_score / 10.0,
+            ))
+        return results
 
 
 class CompositeScorer(Scorer):
@@ -155,4 +301,34 @@ class CompositeScorer(Scorer):
             components=all_components,
             normalized=normalized,
         )
-
+    
+    def score_batch(self, tickets: Iterable[Ticket]) -> List[Score]:
+        """
+        Calculate composite scores for many tickets.
+        
+        Each child scorer scores the whole batch through its own score_batch,
+        then the per-ticket results are combined exactly as in score().
+        """
+        tickets = list(tickets)
+        weights = [
+            self.weights[i] if i < len(self.weights) else 1.0
+            for i in range(len(self.scorers))
+        ]
+        prefixes = [f"{scorer.__class__.__name__}." for scorer in self.scorers]
+        columns = [scorer.score_batch(tickets) for scorer in self.scorers]
+        total_weight = sum(self.weights)
+        
+        results = []
+        for row in (zip(*columns) if columns else [()] * len(tickets)):
+            all_components = {}
+            weighted_sum = 0.0
+            for score_result, weight, prefix in zip(row, weights, prefixes):
+                for comp_name, comp_value in score_result.components.items():
+                    all_components[prefix + comp_name] = comp_value
+                weighted_sum += score_result.total * weight
+            results.append(Score(
+                total=weighted_sum,
+                components=all_components,
+                normalized=weighted_sum / total_weight if total_weight > 0 else 0.0,
+            ))
+        return results
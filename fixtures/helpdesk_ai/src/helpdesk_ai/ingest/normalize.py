@@ -3,7 +3,7 @@ Normalizers for converting parsed data into domain models.
 """
 
 from typing import Dict, Any, Optional
-from ..domain.models import Ticket, Category, Priority, TicketStatus
+from ..domain.models import Ticket, Category, Priority, TicketStatus, _STATUS_BY_VALUE
 from ..utils.text import normalize_text, extract_email
 
 
@@ -39,6 +39,14 @@ class TicketNormalizer(Normalizer):
         "normal": Priority.MEDIUM,
     }
     
+    # Input keys consumed as ticket fields; everything else becomes metadata.
+    _RESERVED = frozenset({
+        "ticket_id", "id", "ticket", "title", "subject",
+        "description", "body", "requester_email", "email",
+        "category", "type", "priority", "status",
+        "assigned_to", "assignee", "tags",
+    })
+    
     def normalize(self, data: Dict[str, Any]) -> Ticket:
         """Normalize parsed data into Ticket object."""
         # Extract and normalize fields
@@ -57,25 +65,27 @@ class TicketNormalizer(Normalizer):
         # Extract email from various fields
         email = data.get("requester_email") or data.get("email") or data.get("user_email")
         if not email:
-            # Try to extract from description or other fields
-            email = extract_email(data.get("description", "") + " " + data.get("contact", ""))
+            # Try to extract from description, then contact, scanning each in
+            # place rather than concatenating them
+            email = extract_email(data.get("description", "")) or extract_email(data.get("contact", ""))
         if not email:
             raise ValueError("requester_email is required")
         
         # Normalize category
-        category_str = (data.get("category") or data.get("type") or "general").lower()
-        category = self.CATEGORY_MAP.get(category_str, Category.GENERAL)
+        # Inputs are usually already lowercase, so try them as-is before
+        # allocating a lowercased copy.
+        category_map = self.CATEGORY_MAP
+        category_str = data.get("category") or data.get("type") or "general"
+        category = category_map.get(category_str) or category_map.get(category_str.lower(), Category.GENERAL)
         
         # Normalize priority
-        priority_str = (data.get("priority") or "medium").lower()
-        priority = self.PRIORITY_MAP.get(priority_str, Priority.MEDIUM)
+        priority_map = self.PRIORITY_MAP
+        priority_str = data.get("priority") or "medium"
+        priority = priority_map.get(priority_str) or priority_map.get(priority_str.lower(), Priority.MEDIUM)
         
         # Normalize status
-        status_str = (data.get("status") or "new").lower()
-        try:
-            status = TicketStatus(status_str)
-        except ValueError:
-            status = TicketStatus.NEW
+        status_str = data.get("status") or "new"
+        status = _STATUS_BY_VALUE.get(status_str) or _STATUS_BY_VALUE.get(status_str.lower(), TicketStatus.NEW)
         
         # Extract optional fields
         assigned_to = data.get("assigned_to") or data.get("assignee")
@@ -83,11 +93,8 @@ class TicketNormalizer(Normalizer):
         if isinstance(tags, str):
             tags = [t.strip() for t in tags.split(",")]
         
-        metadata = {k: v for k, v in data.items() 
-                   if k not in ["ticket_id", "id", "ticket", "title", "subject",
-                               "description", "body", "requester_email", "email",
-                               "category", "type", "priority", "status",
-                               "assigned_to", "assignee", "tags"]}
+        reserved = self._RESERVED
+        metadata = {k: v for k, v in data.items() if k not in reserved}
         
         return Ticket(
             ticket_id=str(ticket_id),
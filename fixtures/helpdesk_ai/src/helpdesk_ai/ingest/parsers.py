@@ -6,9 +6,18 @@ import json
 import csv
 from io import StringIO
 from typing import Dict, Any, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..domain.models import Ticket, Category, Priority, TicketStatus
 
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
 class Parser:
     """Base parser interface."""
     
@@ -20,15 +29,25 @@ class Parser:
 class JSONParser(Parser):
     """Parser for JSON-formatted ticket data."""
     
-    def parse(self, data: str) -> Dict[str, Any]:
-        """Parse JSON data into ticket dictionary."""
+    def parse(self, data: str, raise_on_fail: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Parse JSON data into ticket dictionary.
+        
+        With raise_on_fail=False, invalid input returns None instead of
+        raising, which saves building an exception on the fallback path.
+        """
         try:
-            parsed = json.loads(data)
-            if not isinstance(parsed, dict):
-                raise ValueError("JSON must be an object")
-            return parsed
+            parsed = _json_loads(data)
         except json.JSONDecodeError as e:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            if not raise_on_fail:
+                return None
             raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(parsed, dict):
+            if not raise_on_fail:
+                return None
+            raise ValueError("JSON must be an object")
+        return parsed
 
 
 class TextParser(Parser):
@@ -42,24 +61,27 @@ class TextParser(Parser):
         """Parse text data into ticket dictionary."""
         lines = data.split(self.delimiter)
         result = {}
+        # Description lines are collected and joined once at the end
+        desc_parts: List[str] = []
         
         for line in lines:
             line = line.strip()
             if not line or ":" not in line:
                 continue
             
-            key, value = line.split(":", 1)
+            key, _, value = line.partition(":")
             key = key.strip().lower().replace(" ", "_")
             value = value.strip()
             
             if key == "description":
+                # Reserve the key's position on first occurrence
                 result.setdefault("description", "")
-                result["description"] += value + "\n"
+                desc_parts.append(value)
             else:
                 result[key] = value
         
-        if "description" in result:
-            result["description"] = result["description"].rstrip()
+        if desc_parts:
+            result["description"] = "\n".join(desc_parts).rstrip()
         
         return result
 
@@ -73,20 +95,22 @@ class CSVParser(Parser):
     
     def parse(self, data: str) -> Dict[str, Any]:
         """Parse CSV data into ticket dictionary."""
+        # Only the first one or two rows are used, so stop reading there
+        # instead of tokenizing the whole input
         reader = csv.reader(StringIO(data))
-        rows = list(reader)
+        first = next(reader, None)
         
-        if not rows:
+        if first is None:
             raise ValueError("CSV data is empty")
         
         if self.has_header:
-            headers = [h.strip().lower().replace(" ", "_") for h in rows[0]]
-            if len(rows) < 2:
+            headers = [h.strip().lower().replace(" ", "_") for h in first]
+            values = next(reader, None)
+            if values is None:
                 raise ValueError("CSV has header but no data rows")
-            values = rows[1]
         else:
-            headers = [f"field_{i}" for i in range(len(rows[0]))]
-            values = rows[0]
+            headers = [f"field_{i}" for i in range(len(first))]
+            values = first
         
         if len(headers) != len(values):
             raise ValueError("Header and value count mismatch")
@@ -99,20 +123,48 @@ class MultiFormatParser:
     
     def __init__(self):
         """Initialize multi-format parser."""
+        self.json_parser = JSONParser()
+        self.csv_parser = CSVParser()
+        self.text_parser = TextParser()
         self.parsers = [
-            JSONParser(),
-            CSVParser(),
-            TextParser(),
+            self.json_parser,
+            self.csv_parser,
+            self.text_parser,
         ]
     
+    def _sniff(self, data: str) -> Parser:
+        """Pick the likely parser from the first characters of the input."""
+        stripped = data.lstrip()
+        if stripped[:1] in ("{", "["):
+            return self.json_parser
+        # A comma-separated first line with more lines after it may be a CSV
+        # header even if it contains a colon; CSV is tried first, and
+        # TextParser (which never fails) only after it.
+        first_line, newline, _ = stripped.partition("\n")
+        if newline and "," in first_line:
+            return self.csv_parser
+        return self.text_parser
+    
     def parse(self, data: str) -> Dict[str, Any]:
-        """Try parsing with each parser until one succeeds."""
-        errors = []
+        """Parse with the sniffed parser, falling back to trying each parser."""
+        sniffed = self._sniff(data)
+        if sniffed is self.json_parser:
+            result = sniffed.parse(data, raise_on_fail=False)
+            if result is not None:
+                return result
+            errors = ["JSONParser: invalid JSON object"]
+        else:
+            try:
+                return sniffed.parse(data)
+            except Exception as e:
+                errors = [f"{sniffed.__class__.__name__}: {str(e)}"]
+        
         for parser in self.parsers:
+            if parser is sniffed:
+                continue
             try:
                 return parser.parse(data)
             except Exception as e:
                 errors.append(f"{parser.__class__.__name__}: {str(e)}")
         
         raise ValueError(f"Failed to parse with any parser: {'; '.join(errors)}")
-
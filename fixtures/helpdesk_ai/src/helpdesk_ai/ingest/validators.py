@@ -2,10 +2,30 @@
 Validators for ensuring data quality and completeness.
 """
 
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import re
 
 
+# (field, aliases, required, match, max_len, non_blank, unchecked aliases)
+FieldSpec = Tuple[
+    str, Tuple[str, ...], bool, Optional[Callable[[str], Any]], Optional[int], bool, Tuple[str, ...]
+]
+
+
+def _memoize_match(match: Callable[[str], Any]) -> Callable[[str], bool]:
+    """Wrap a pattern matcher so repeated values skip the regex engine."""
+    results: Dict[str, bool] = {}
+    
+    def cached(value: str) -> bool:
+        hit = results.get(value)
+        if hit is None:
+            hit = results[value] = bool(match(value))
+        return hit
+    
+    return cached
+
+
 class ValidationError(Exception):
     """Raised when validation fails."""
     
@@ -29,6 +49,24 @@ class TicketValidator(Validator):
     
     EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
     TICKET_ID_PATTERN = re.compile(r'^[A-Z0-9-]+$')
+    # Bound match method, looked up once per class instead of per call
+    _match_ticket_id = TICKET_ID_PATTERN.match
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _match_email(email: str) -> bool:
+        """Check the email format, memoized since requesters repeat."""
+        return TicketValidator.EMAIL_PATTERN.match(email) is not None
+    
+    # Checked in order by a single pass in validate(); see FieldSpec
+    _SCHEMA: Tuple[FieldSpec, ...] = (
+        ("ticket_id", ("ticket_id", "id", "ticket"), True, _match_ticket_id, None, False, ()),
+        ("title", ("title", "subject"), True, None, 200, True, ()),
+        ("description", ("description",), True, None, None, True, ("body",)),
+        ("requester_email", ("requester_email", "email", "user_email"), True, _match_email, None, False, ()),
+        ("category", ("category", "type"), False, None, None, False, ()),
+        ("priority", ("priority",), False, None, None, False, ()),
+    )
     
     def validate(self, data: Dict[str, Any]) -> List[ValidationError]:
         """
@@ -37,63 +75,51 @@ class TicketValidator(Validator):
         BUG: Missing validation for 'description' field in one code path.
         When data comes from certain parsers, description validation is skipped.
         """
-        errors = []
-        
-        # Validate ticket_id
-        ticket_id = data.get("ticket_id") or data.get("id") or data.get("ticket")
-        if not ticket_id:
-            errors.append(ValidationError("ticket_id is required", "ticket_id"))
-        elif not isinstance(ticket_id, str):
-            errors.append(ValidationError("ticket_id must be a string", "ticket_id"))
-        elif not self.TICKET_ID_PATTERN.match(ticket_id):
-            errors.append(ValidationError("ticket_id format is invalid", "ticket_id"))
-        
-        # Validate title
-        title = data.get("title") or data.get("subject")
-        if not title:
-            errors.append(ValidationError("title is required", "title"))
-        elif not isinstance(title, str):
-            errors.append(ValidationError("title must be a string", "title"))
-        elif len(title.strip()) == 0:
-            errors.append(ValidationError("title cannot be empty", "title"))
-        elif len(title) > 200:
-            errors.append(ValidationError("title exceeds maximum length of 200", "title"))
-        
-        # BUG: Description validation is missing when data comes from certain sources
-        # Specifically, if data has "body" but not "description", validation is skipped
-        description = data.get("description")
-        if not description:
-            # Check alternative field names
-            description = data.get("body")
-            if description:
-                # BUG: We found "body" but don't validate it here
-                # Should validate description even if it comes from "body" field
-                pass
-            else:
-                errors.append(ValidationError("description is required", "description"))
-        elif not isinstance(description, str):
-            errors.append(ValidationError("description must be a string", "description"))
-        elif len(description.strip()) == 0:
-            errors.append(ValidationError("description cannot be empty", "description"))
-        
-        # Validate email
-        email = data.get("requester_email") or data.get("email") or data.get("user_email")
-        if not email:
-            errors.append(ValidationError("requester_email is required", "requester_email"))
-        elif not isinstance(email, str):
-            errors.append(ValidationError("requester_email must be a string", "requester_email"))
-        elif not self.EMAIL_PATTERN.match(email):
-            errors.append(ValidationError("requester_email format is invalid", "requester_email"))
+        return self._validate(data, self._SCHEMA)
+    
+    def validate_batch(self, records: List[Dict[str, Any]]) -> List[List[ValidationError]]:
+        """
+        Validate many tickets, returning one error list per record.
         
-        # Validate category if present
-        category = data.get("category") or data.get("type")
-        if category and not isinstance(category, str):
-            errors.append(ValidationError("category must be a string", "category"))
+        Format checks are memoized for the duration of the batch, so each
+        distinct email or ticket_id is matched against its pattern once.
+        """
+        schema = tuple(
+            (field, aliases, required, _memoize_match(match) if match else None,
+             max_len, non_blank, unchecked)
+            for field, aliases, required, match, max_len, non_blank, unchecked in self._SCHEMA
+        )
+        validate = self._validate
+        return [validate(data, schema) for data in records]
+    
+    @staticmethod
+    def _validate(data: Dict[str, Any], schema: Tuple[FieldSpec, ...]) -> List[ValidationError]:
+        """Run one record through a schema table."""
+        errors: List[ValidationError] = []
+        append = errors.append
+        get = data.get
         
-        # Validate priority if present
-        priority = data.get("priority")
-        if priority and not isinstance(priority, str):
-            errors.append(ValidationError("priority must be a string", "priority"))
+        for field, aliases, required, match, max_len, non_blank, unchecked in schema:
+            # First truthy alias wins, mirroring the old `a or b or c` chains
+            value = None
+            for alias in aliases:
+                value = get(alias)
+                if value:
+                    break
+            if not value:
+                # BUG: Found under an unchecked alias (e.g. "body") satisfies
+                # the requirement but the value is never validated
+                if required and not any(get(alias) for alias in unchecked):
+                    append(ValidationError(f"{field} is required", field))
+                continue
+            if not isinstance(value, str):
+                append(ValidationError(f"{field} must be a string", field))
+            elif non_blank and not value.strip():
+                append(ValidationError(f"{field} cannot be empty", field))
+            elif max_len is not None and len(value) > max_len:
+                append(ValidationError(f"{field} exceeds maximum length of {max_len}", field))
+            elif match is not None and not match(value):
+                append(ValidationError(f"{field} format is invalid", field))
         
         return errors
     
@@ -103,14 +129,14 @@ class TicketValidator(Validator):
         
         BUG: This method doesn't validate description at all, even when provided.
         """
-        errors = []
+        errors: List[ValidationError] = []
         
         # Only validate fields that are present
         if "ticket_id" in data:
             ticket_id = data["ticket_id"]
             if not isinstance(ticket_id, str):
                 errors.append(ValidationError("ticket_id must be a string", "ticket_id"))
-            elif not self.TICKET_ID_PATTERN.match(ticket_id):
+            elif not self._match_ticket_id(ticket_id):
                 errors.append(ValidationError("ticket_id format is invalid", "ticket_id"))
         
         if "title" in data:
@@ -127,7 +153,7 @@ class TicketValidator(Validator):
             email = data["requester_email"]
             if not isinstance(email, str):
                 errors.append(ValidationError("requester_email must be a string", "requester_email"))
-            elif not self.EMAIL_PATTERN.match(email):
+            elif not self._match_email(email):
                 errors.append(ValidationError("requester_email format is invalid", "requester_email"))
         
         return errors
@@ -8,7 +8,7 @@ from typing import List, Optional, Dict, Any
 from ..domain.models import Ticket
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditLog:
     """Represents an audit log entry."""
     
@@ -27,6 +27,12 @@ class AuditService:
     def __init__(self):
         """Initialize audit service."""
         self._logs: List[AuditLog] = []
+        # Per-ticket and per-actor indices, so lookups skip a full scan
+        self._by_ticket: Dict[str, List[AuditLog]] = {}
+        self._by_actor: Dict[str, List[AuditLog]] = {}
+        # True while append order is also timestamp order (the normal case,
+        # since log() stamps entries with the current time)
+        self._in_order = True
     
     def log(
         self,
@@ -46,22 +52,45 @@ class AuditService:
             changes=changes or {},
             metadata=metadata or {},
         )
+        if self._logs and log.timestamp < self._logs[-1].timestamp:
+            self._in_order = False
         self._logs.append(log)
+        self._by_ticket.setdefault(ticket_id, []).append(log)
+        self._by_actor.setdefault(actor, []).append(log)
         return log
     
     def get_logs_for_ticket(self, ticket_id: str) -> List[AuditLog]:
         """Get all audit logs for a ticket."""
-        return [log for log in self._logs if log.ticket_id == ticket_id]
+        return list(self._by_ticket.get(ticket_id, ()))
     
     def get_logs_for_actor(self, actor: str) -> List[AuditLog]:
         """Get all audit logs for an actor."""
-        return [log for log in self._logs if log.actor == actor]
+        return list(self._by_actor.get(actor, ()))
     
     def get_recent_logs(self, limit: int = 100) -> List[AuditLog]:
         """Get recent audit logs."""
-        return sorted(self._logs, key=lambda x: x.timestamp, reverse=True)[:limit]
+        logs = self._logs
+        if not self._in_order:
+            return sorted(logs, key=lambda x: x.timestamp, reverse=True)[:limit]
+        
+        # Walk back from the newest entry instead of sorting. Entries with
+        # equal timestamps keep their append order, as the stable sort did.
+        count = len(range(len(logs))[:limit])
+        recent: List[AuditLog] = []
+        end = len(logs)
+        while len(recent) < count:
+            start = end - 1
+            timestamp = logs[start].timestamp
+            while start > 0 and logs[start - 1].timestamp == timestamp:
+                start -= 1
+            recent.extend(logs[start:end])
+            end = start
+        return recent[:count]
     
     def clear(self) -> None:
         """Clear all audit logs."""
         self._logs.clear()
+        self._by_ticket.clear()
+        self._by_actor.clear()
+        self._in_order = True
 
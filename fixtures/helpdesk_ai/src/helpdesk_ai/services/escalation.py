@@ -7,6 +7,16 @@ from datetime import datetime, timedelta
 from ..domain.models import Ticket, TicketStatus, Priority
 
 
+# Statuses that are never escalated
+_CLOSED = frozenset({TicketStatus.RESOLVED, TicketStatus.CLOSED})
+# One escalation step up; CRITICAL is already the top
+_BUMP = {
+    Priority.LOW: Priority.MEDIUM,
+    Priority.MEDIUM: Priority.HIGH,
+    Priority.HIGH: Priority.CRITICAL,
+}
+
+
 class EscalationService:
     """Service for managing ticket escalations."""
     
@@ -19,54 +29,74 @@ class EscalationService:
         self.escalation_threshold_hours = escalation_threshold_hours
         self.auto_escalate_critical = auto_escalate_critical
     
-    def should_escalate(self, ticket: Ticket) -> bool:
-        """Check if a ticket should be escalated."""
+    def should_escalate(self, ticket: Ticket, now: Optional[datetime] = None) -> bool:
+        """Check if a ticket should be escalated (as of now, default the current time)."""
         # Auto-escalate critical tickets
-        if self.auto_escalate_critical and ticket.priority == Priority.CRITICAL:
-            if ticket.status not in [TicketStatus.RESOLVED, TicketStatus.CLOSED]:
+        if self.auto_escalate_critical and ticket.priority is Priority.CRITICAL:
+            if ticket.status not in _CLOSED:
                 return True
         
         # Escalate based on age
-        age = datetime.now() - ticket.created_at
+        age = (now or datetime.now()) - ticket.created_at
         if age > timedelta(hours=self.escalation_threshold_hours):
-            if ticket.status not in [TicketStatus.RESOLVED, TicketStatus.CLOSED]:
+            if ticket.status not in _CLOSED:
                 return True
         
         return False
     
-    def escalate(self, ticket: Ticket, reason: Optional[str] = None) -> Ticket:
-        """Escalate a ticket."""
-        if ticket.status in [TicketStatus.RESOLVED, TicketStatus.CLOSED]:
+    def escalate(
+        self,
+        ticket: Ticket,
+        reason: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Ticket:
+        """Escalate a ticket, stamping it with now (default the current time)."""
+        return self._apply_escalation(ticket, reason, (now or datetime.now()).isoformat())
+    
+    def _apply_escalation(self, ticket: Ticket, reason: Optional[str], escalated_at: str) -> Ticket:
+        """Escalate a ticket with a preformatted escalated_at timestamp."""
+        if ticket.status in _CLOSED:
             return ticket
         
-        # Increase priority if not already critical
-        if ticket.priority != Priority.CRITICAL:
-            if ticket.priority == Priority.LOW:
-                ticket.priority = Priority.MEDIUM
-            elif ticket.priority == Priority.MEDIUM:
-                ticket.priority = Priority.HIGH
-            elif ticket.priority == Priority.HIGH:
-                ticket.priority = Priority.CRITICAL
-        
-        ticket.status = TicketStatus.ESCALATED
-        ticket.metadata["escalated_at"] = datetime.now().isoformat()
+        ticket.metadata["escalated_at"] = escalated_at
         if reason:
             ticket.metadata["escalation_reason"] = reason
         
+        # Through update() so updated_at marks the change for stores and
+        # memoized rule matches; priority rises unless already critical
+        ticket.update(
+            priority=_BUMP.get(ticket.priority, ticket.priority),
+            status=TicketStatus.ESCALATED,
+        )
         return ticket
     
     def check_and_escalate(self, ticket: Ticket) -> Optional[Ticket]:
         """Check if ticket should be escalated and escalate if needed."""
-        if self.should_escalate(ticket):
-            return self.escalate(ticket, "Automatic escalation due to age or priority")
+        now = datetime.now()
+        if self.should_escalate(ticket, now):
+            return self.escalate(ticket, "Automatic escalation due to age or priority", now)
         return None
     
+    def _escalation_mask(self, tickets: List[Ticket], now: datetime) -> List[bool]:
+        """Flag tickets that should escalate, evaluated column-wise in one pass."""
+        cutoff = now - timedelta(hours=self.escalation_threshold_hours)
+        closed = _CLOSED
+        critical = Priority.CRITICAL if self.auto_escalate_critical else None
+        return [
+            t.status not in closed and (t.priority is critical or t.created_at < cutoff)
+            for t in tickets
+        ]
+    
     def batch_check(self, tickets: List[Ticket]) -> List[Ticket]:
         """Check multiple tickets for escalation."""
-        escalated = []
-        for ticket in tickets:
-            escalated_ticket = self.check_and_escalate(ticket)
-            if escalated_ticket:
-                escalated.append(escalated_ticket)
-        return escalated
-
+        # One clock read and one isoformat for the whole batch
+        now = datetime.now()
+        mask = self._escalation_mask(tickets, now)
+        escalated_at = now.isoformat()
+        apply = self._apply_escalation
+        reason = "Automatic escalation due to age or priority"
+        return [
+            apply(ticket, reason, escalated_at)
+            for ticket, flagged in zip(tickets, mask)
+            if flagged
+        ]
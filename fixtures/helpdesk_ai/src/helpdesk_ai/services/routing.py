@@ -8,7 +8,7 @@ from ..domain.models import Ticket, Priority, Category
 from ..domain.rules import RuleEngine, Rule
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingResult:
     """Result of routing a ticket."""
     
@@ -73,5 +73,31 @@ class Router:
     
     def batch_route(self, tickets: List[Ticket]) -> List[RoutingResult]:
         """Route multiple tickets."""
-        return [self.route(ticket) for ticket in tickets]
+        # Same logic as route(), with the per-ticket lookups bound once
+        get_match = self.rule_engine.get_highest_priority_match
+        default_assignee = self.default_assignees.get
+        results = []
+        append = results.append
+        for ticket in tickets:
+            matching_rule = get_match(ticket)
+            if matching_rule:
+                assigned_to = matching_rule.target_assignee or default_assignee(ticket.category)
+                priority = matching_rule.priority
+                category = matching_rule.target_category or ticket.category
+                rule_matched = matching_rule.rule_id
+                confidence = 1.0
+            else:
+                assigned_to = default_assignee(ticket.category)
+                priority = ticket.priority
+                category = ticket.category
+                rule_matched = None
+                confidence = 0.5
+            
+            ticket.update(
+                assigned_to=assigned_to,
+                priority=priority,
+                category=category,
+            )
+            append(RoutingResult(ticket, assigned_to, priority, category, rule_matched, confidence))
+        return results
 
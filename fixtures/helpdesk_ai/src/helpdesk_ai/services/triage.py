@@ -35,12 +35,11 @@ class TriageService:
         return routing_result
     
     def batch_triage(self, tickets: List[Ticket]) -> List[RoutingResult]:
-        """Triage multiple tickets."""
-        results = []
-        for ticket in tickets:
-            result = self.triage(ticket)
-            results.append(result)
-        return results
+        """Triage multiple tickets, scoring them as one batch."""
+        scores = self.scorer.score_batch(tickets)
+        for ticket, score in zip(tickets, scores):
+            ticket.score = score.normalized if score.normalized is not None else score.total
+        return self.router.batch_route(tickets)
     
     def get_score(self, ticket: Ticket) -> Score:
         """Get score for a ticket without routing."""
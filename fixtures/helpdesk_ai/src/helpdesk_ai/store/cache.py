@@ -2,11 +2,37 @@
 Caching layer for ticket operations.
 """
 
-from typing import Optional, Dict, Any, Callable
+import hashlib
+import json
+import time
+from array import array
+from typing import Optional, Dict, Any, Callable, List
 from datetime import datetime, timedelta
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..domain.models import Ticket
 
 
+# Expiry recorded for entries without a TTL (and for free slots)
+_NEVER = float("inf")
+
+
+if orjson is not None:
+    def _canonical_json(data: Dict[str, Any]) -> bytes:
+        """Serialize data with sorted keys; unknown types fall back to repr."""
+        return orjson.dumps(
+            data, default=repr, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+else:
+    def _canonical_json(data: Dict[str, Any]) -> bytes:
+        """Serialize data with sorted keys; unknown types fall back to repr."""
+        return json.dumps(data, sort_keys=True, default=repr, separators=(",", ":")).encode("utf-8")
+
+
 class Cache:
     """Base cache interface."""
     
@@ -30,6 +56,8 @@ class Cache:
 class CacheEntry:
     """Represents a cache entry with expiration."""
     
+    __slots__ = ("value", "created_at", "ttl", "expires_at")
+    
     def __init__(self, value: Any, ttl: Optional[int] = None):
         """Initialize cache entry."""
         self.value = value
@@ -52,68 +80,109 @@ class MemoryCache(Cache):
     
     def __init__(self, default_ttl: Optional[int] = None):
         """Initialize memory cache."""
-        self._entries: Dict[str, CacheEntry] = {}
         self.default_ttl = default_ttl
+        self._reset()
+    
+    def _reset(self) -> None:
+        """Allocate empty slot storage."""
+        # Entries live in parallel slots rather than one object per key:
+        # key -> slot index, plus per-slot key, value and expiry
+        # (time.monotonic() seconds in a packed double array, _NEVER for
+        # entries without a TTL). Freed slots are recycled by set().
+        self._index: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._values: List[Any] = []
+        self._expiries = array("d")
+        self._free: List[int] = []
+    
+    def _release(self, key: str, slot: int) -> None:
+        """Drop a key and return its slot to the free list."""
+        del self._index[key]
+        self._keys[slot] = None
+        self._values[slot] = None
+        self._expiries[slot] = _NEVER
+        self._free.append(slot)
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        entry = self._entries.get(key)
-        if entry is None:
+        slot = self._index.get(key)
+        if slot is None:
             return None
         
-        if entry.is_expired():
-            del self._entries[key]
+        expires_at = self._expiries[slot]
+        if expires_at != _NEVER and time.monotonic() > expires_at:
+            self._release(key, slot)
             return None
         
-        return entry.value
+        return self._values[slot]
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set value in cache."""
         ttl = ttl or self.default_ttl
-        self._entries[key] = CacheEntry(value, ttl)
+        expires_at = time.monotonic() + ttl if ttl else _NEVER
+        slot = self._index.get(key)
+        if slot is not None:
+            self._values[slot] = value
+            self._expiries[slot] = expires_at
+        elif self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._expiries[slot] = expires_at
+            self._index[key] = slot
+        else:
+            self._index[key] = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._expiries.append(expires_at)
     
     def delete(self, key: str) -> None:
         """Delete value from cache."""
-        if key in self._entries:
-            del self._entries[key]
+        slot = self._index.get(key)
+        if slot is not None:
+            self._release(key, slot)
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        self._entries.clear()
+        self._reset()
+    
+    def sweep(self) -> int:
+        """Evict every expired entry in one pass. Returns the number evicted."""
+        now = time.monotonic()
+        # Free slots hold _NEVER, so only live expired entries qualify
+        dead = [slot for slot, expires_at in enumerate(self._expiries) if expires_at < now]
+        keys = self._keys
+        for slot in dead:
+            self._release(keys[slot], slot)
+        return len(dead)
     
     def _generate_key(self, prefix: str, **kwargs) -> str:
         """
         Generate cache key from prefix and kwargs.
         
-        BUG: Key collision - two different requests can map to the same key.
-        When kwargs contain nested dicts or lists, they're converted to string
-        which can cause collisions. Also, order of kwargs matters but isn't
-        normalized, so same data in different order creates different keys.
+        kwargs are serialized as canonical JSON (keys sorted at every level,
+        so nested dicts in any order give the same key) and hashed with a
+        16-byte BLAKE2b digest.
         """
-        # Convert kwargs to string representation
-        # BUG: This doesn't handle nested structures properly
-        # BUG: Order of kwargs affects key generation
-        parts = [prefix]
-        for k, v in sorted(kwargs.items()):
-            # BUG: str(dict) or str(list) can create same string for different objects
-            parts.append(f"{k}={str(v)}")
-        return ":".join(parts)
+        digest = hashlib.blake2b(_canonical_json(kwargs), digest_size=16).hexdigest()
+        return f"{prefix}:{digest}"
     
     def cache_ticket(self, ticket: Ticket) -> str:
         """Cache a ticket and return its key."""
-        # BUG: This key generation can collide
-        # Two tickets with same email and category but different IDs get same key
         key = self._generate_key(
             "ticket",
             email=ticket.requester_email,
             category=ticket.category.value,
-            # BUG: ticket_id not included, causing potential collisions
+            ticket_id=ticket.ticket_id,
         )
         self.set(key, ticket)
+        # Point the (email, category) lookup at the most recent ticket
+        self.set(self._generate_key("ticket", email=ticket.requester_email, category=ticket.category.value), key)
         return key
     
     def get_cached_ticket(self, email: str, category: str) -> Optional[Ticket]:
-        """Get cached ticket by email and category."""
-        key = self._generate_key("ticket", email=email, category=category)
+        """Get the most recently cached ticket by email and category."""
+        key = self.get(self._generate_key("ticket", email=email, category=category))
+        if key is None:
+            return None
         return self.get(key)
-
@@ -4,11 +4,50 @@ File-based storage implementation for tickets.
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..domain.models import Ticket
 
 
+# Concurrent file reads in list_all(); reads release the GIL
+READ_WORKERS = 16
+
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+
+    def _dumps(data) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    """Read a file, returning None if it vanished or cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _ticket_file(tickets_dir: str, ticket_id: str) -> str:
+    """Path string for a ticket file, memoized for hot ticket ids."""
+    return os.path.join(tickets_dir, f"{ticket_id}.json")
+
+
 class FileStore:
     """File-based ticket storage."""
     
@@ -19,51 +58,56 @@ class FileStore:
         self.tickets_dir = self.base_path / "tickets"
         self.tickets_dir.mkdir(exist_ok=True)
     
-    def _ticket_path(self, ticket_id: str) -> Path:
+    def _ticket_path(self, ticket_id: str) -> str:
         """Get file path for a ticket."""
-        return self.tickets_dir / f"{ticket_id}.json"
+        return _ticket_file(os.fspath(self.tickets_dir), ticket_id)
     
     def save(self, ticket: Ticket) -> None:
         """Save a ticket to file."""
-        path = self._ticket_path(ticket.ticket_id)
-        with open(path, "w") as f:
-            json.dump(ticket.to_dict(), f, indent=2)
+        with open(self._ticket_path(ticket.ticket_id), "wb") as f:
+            f.write(_dumps(ticket.to_dict()))
     
     def get(self, ticket_id: str) -> Optional[Ticket]:
         """Get a ticket by ID."""
-        path = self._ticket_path(ticket_id)
-        if not path.exists():
-            return None
-        
+        # A missing file is just another failed read; no separate stat
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            return Ticket.from_dict(data)
+            with open(self._ticket_path(ticket_id), "rb") as f:
+                return Ticket._from_owned_dict(_loads(f.read()))
         except Exception:
             return None
     
     def delete(self, ticket_id: str) -> bool:
         """Delete a ticket by ID. Returns True if deleted."""
-        path = self._ticket_path(ticket_id)
-        if path.exists():
-            path.unlink()
-            return True
-        return False
+        try:
+            os.unlink(self._ticket_path(ticket_id))
+        except FileNotFoundError:
+            return False
+        return True
     
     def list_all(self) -> List[Ticket]:
         """List all tickets."""
+        # Overlap the file reads on a thread pool, then parse on this thread
+        with os.scandir(self.tickets_dir) as entries:
+            paths = [entry.path for entry in entries if entry.name.endswith(".json")]
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(paths))) as pool:
+                blobs = list(pool.map(_read_bytes, paths))
+        else:
+            blobs = [_read_bytes(path) for path in paths]
+        
         tickets = []
-        for path in self.tickets_dir.glob("*.json"):
+        from_dict = Ticket._from_owned_dict
+        for blob in blobs:
+            if not blob:
+                continue
             try:
-                ticket_id = path.stem
-                ticket = self.get(ticket_id)
-                if ticket:
-                    tickets.append(ticket)
+                tickets.append(from_dict(_loads(blob)))
             except Exception:
                 continue
         return tickets
     
     def count(self) -> int:
         """Get total number of tickets."""
-        return len(list(self.tickets_dir.glob("*.json")))
+        with os.scandir(self.tickets_dir) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(".json"))
 
@@ -2,20 +2,81 @@
 In-memory storage implementation for tickets.
 """
 
-from typing import Dict, Optional, List
+from datetime import datetime
+from typing import Dict, Optional, List, Any, FrozenSet, Iterator, Set, Tuple
 from ..domain.models import Ticket
 
 
+# Ticket fields with an inverted index for search(). Before using the
+# indices, search() re-indexes tickets whose updated_at changed since they
+# were indexed, i.e. tickets changed through Ticket.update(). Tickets changed
+# by direct assignment should be saved again.
+INDEXED_FIELDS = ("category", "status", "priority", "assigned_to", "requester_email")
+
+_NO_IDS: FrozenSet[str] = frozenset()
+
+
 class MemoryStore:
     """In-memory ticket storage."""
     
     def __init__(self):
         """Initialize memory store."""
         self._tickets: Dict[str, Ticket] = {}
+        # field -> value -> ids of tickets saved with that value
+        self._indices: Dict[str, Dict[Any, Set[str]]] = {f: {} for f in INDEXED_FIELDS}
+        # ticket_id -> indexed values, to unindex on replace/delete
+        self._indexed_values: Dict[str, Tuple[Any, ...]] = {}
+        # ticket_id -> insertion sequence, to return results in store order
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        # ticket_id -> updated_at object seen when the ticket was indexed
+        self._indexed_at: Dict[str, datetime] = {}
+    
+    def _reindex_changed(self) -> None:
+        """Re-index the tickets updated in place since they were indexed."""
+        tickets = self._tickets
+        indexed_at = self._indexed_at
+        # update() always assigns a new datetime, so identity is enough
+        changed = [
+            ticket_id for ticket_id, ticket in tickets.items()
+            if ticket.updated_at is not indexed_at[ticket_id]
+        ]
+        for ticket_id in changed:
+            self._unindex(ticket_id)
+            self._index(ticket_id, tickets[ticket_id])
+    
+    def _index(self, ticket_id: str, ticket: Ticket) -> None:
+        """Add a ticket's indexed field values to the inverted indices."""
+        values = tuple(getattr(ticket, f, None) for f in INDEXED_FIELDS)
+        self._indexed_values[ticket_id] = values
+        self._indexed_at[ticket_id] = ticket.updated_at
+        for field, value in zip(INDEXED_FIELDS, values):
+            self._indices[field].setdefault(value, set()).add(ticket_id)
+    
+    def _unindex(self, ticket_id: str) -> None:
+        """Remove a ticket from the inverted indices."""
+        values = self._indexed_values.pop(ticket_id, None)
+        self._indexed_at.pop(ticket_id, None)
+        if values is None:
+            return
+        for field, value in zip(INDEXED_FIELDS, values):
+            index = self._indices[field]
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(ticket_id)
+                if not ids:
+                    del index[value]
     
     def save(self, ticket: Ticket) -> None:
         """Save a ticket."""
-        self._tickets[ticket.ticket_id] = ticket
+        ticket_id = ticket.ticket_id
+        if ticket_id not in self._tickets:
+            self._order[ticket_id] = self._next_order
+            self._next_order += 1
+        else:
+            self._unindex(ticket_id)
+        self._tickets[ticket_id] = ticket
+        self._index(ticket_id, ticket)
     
     def get(self, ticket_id: str) -> Optional[Ticket]:
         """Get a ticket by ID."""
@@ -25,6 +86,8 @@ class MemoryStore:
         """Delete a ticket by ID. Returns True if deleted."""
         if ticket_id in self._tickets:
             del self._tickets[ticket_id]
+            del self._order[ticket_id]
+            self._unindex(ticket_id)
             return True
         return False
     
@@ -32,10 +95,48 @@ class MemoryStore:
         """List all tickets."""
         return list(self._tickets.values())
     
+    def iter_all(self) -> Iterator[Ticket]:
+        """
+        Iterate over a snapshot of all tickets.
+        
+        The snapshot is a tuple of references, so saves and deletes from
+        other threads during iteration are safe.
+        """
+        return iter(tuple(self._tickets.values()))
+    
     def search(self, **criteria) -> List[Ticket]:
-        """Search tickets by criteria."""
+        """
+        Search tickets by criteria.
+        
+        Indexed criteria narrow the candidates by set intersection; every
+        criterion is then checked against the candidates' current values.
+        """
+        if self._indices.keys() & criteria.keys():
+            self._reindex_changed()
+        
+        candidate_ids = None
+        for key, value in criteria.items():
+            index = self._indices.get(key)
+            if index is None:
+                continue
+            try:
+                ids = index.get(value, _NO_IDS)
+            except TypeError:
+                # Unhashable value; leave it to the attribute check below
+                continue
+            candidate_ids = ids if candidate_ids is None else candidate_ids & ids
+            if not candidate_ids:
+                return []
+        
+        if candidate_ids is None:
+            candidates = self._tickets.values()
+        else:
+            tickets = self._tickets
+            order = self._order
+            candidates = [tickets[ticket_id] for ticket_id in sorted(candidate_ids, key=order.__getitem__)]
+        
         results = []
-        for ticket in self._tickets.values():
+        for ticket in candidates:
             match = True
             for key, value in criteria.items():
                 if not hasattr(ticket, key):
@@ -55,4 +156,8 @@ class MemoryStore:
     def clear(self) -> None:
         """Clear all tickets."""
         self._tickets.clear()
-
+        for index in self._indices.values():
+            index.clear()
+        self._indexed_values.clear()
+        self._indexed_at.clear()
+        self._order.clear()
@@ -1,6 +1,6 @@
 """Utility modules."""
 
-from .time import format_timestamp, parse_timestamp, time_ago
+from .time import format_timestamp, parse_timestamp, time_ago, time_ago_batch
 from .text import normalize_text, extract_email, truncate_text
 from .ids import generate_ticket_id, generate_audit_id
 from .errors import HelpdeskError, ValidationError, StorageError
@@ -9,6 +9,7 @@ __all__ = [
     "format_timestamp",
     "parse_timestamp",
     "time_ago",
+    "time_ago_batch",
     "normalize_text",
     "extract_email",
     "truncate_text",
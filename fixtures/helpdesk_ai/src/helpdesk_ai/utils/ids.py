@@ -2,22 +2,37 @@
 ID generation utilities.
 """
 
+import os
+import time
 import uuid
 from datetime import datetime
+from typing import Tuple
+
+
+# (epoch second, "%Y%m%d" stamp) of the last ID generated; strftime is the
+# dominant cost when IDs are minted in bulk, so reuse it within a second.
+_date_stamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _date_stamp() -> str:
+    """Current local date as YYYYMMDD, recomputed at most once per second."""
+    global _date_stamp_cache
+    second = int(time.time())
+    cached_second, stamp = _date_stamp_cache
+    if second != cached_second:
+        stamp = datetime.fromtimestamp(second).strftime("%Y%m%d")
+        _date_stamp_cache = (second, stamp)
+    return stamp
 
 
 def generate_ticket_id(prefix: str = "TKT") -> str:
     """Generate a unique ticket ID."""
-    timestamp = datetime.now().strftime("%Y%m%d")
-    unique_part = str(uuid.uuid4())[:8].upper()
-    return f"{prefix}-{timestamp}-{unique_part}"
+    return f"{prefix}-{_date_stamp()}-{os.urandom(4).hex().upper()}"
 
 
 def generate_audit_id(prefix: str = "AUD") -> str:
     """Generate a unique audit log ID."""
-    timestamp = datetime.now().strftime("%Y%m%d")
-    unique_part = str(uuid.uuid4())[:8].upper()
-    return f"{prefix}-{timestamp}-{unique_part}"
+    return f"{prefix}-{_date_stamp()}-{os.urandom(4).hex().upper()}"
 
 
 def generate_session_id() -> str:
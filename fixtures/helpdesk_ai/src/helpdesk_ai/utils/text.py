@@ -6,16 +6,32 @@ import re
 from typing import Optional, List
 
 
+_WS_RE = re.compile(r'\s+')
+_EMAIL_RE = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+_FNAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# ASCII characters that can never be part of a word (anything but \w)
+_ASCII_SEPARATORS = str.maketrans(
+    {c: " " for c in map(chr, range(128)) if not (c.isalnum() or c == "_")}
+)
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "from", "as", "is", "was", "are", "were", "be",
+    "been", "have", "has", "had", "do", "does", "did", "will", "would",
+    "should", "could", "may", "might", "must", "can", "this", "that",
+    "these", "those", "i", "you", "he", "she", "it", "we", "they",
+})
+
+
 def normalize_text(text: str) -> str:
     """Normalize text by removing extra whitespace and normalizing line breaks."""
     if not text:
         return ""
     
-    # Replace multiple whitespace with single space
-    text = re.sub(r'\s+', ' ', text)
-    # Normalize line breaks
-    text = re.sub(r'\r\n', '\n', text)
-    text = re.sub(r'\r', '\n', text)
+    # Replace multiple whitespace with single space. \s covers \r and \n,
+    # so no line breaks survive this pass and none need normalizing.
+    text = _WS_RE.sub(' ', text)
     # Remove trailing whitespace
     text = text.strip()
     
@@ -24,8 +40,7 @@ def normalize_text(text: str) -> str:
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email address from text."""
-    email_pattern = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
-    match = email_pattern.search(text)
+    match = _EMAIL_RE.search(text)
     return match.group(0) if match else None
 
 
@@ -38,33 +53,29 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
 
 def extract_keywords(text: str, min_length: int = 3) -> List[str]:
     """Extract keywords from text."""
-    # Simple keyword extraction - words that are not common stop words
-    stop_words = {
-        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-        "of", "with", "by", "from", "as", "is", "was", "are", "were", "be",
-        "been", "have", "has", "had", "do", "does", "did", "will", "would",
-        "should", "could", "may", "might", "must", "can", "this", "that",
-        "these", "those", "i", "you", "he", "she", "it", "we", "they",
-    }
-    
-    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-    keywords = [w for w in words if len(w) >= min_length and w not in stop_words]
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_keywords = []
-    for kw in keywords:
-        if kw not in seen:
-            seen.add(kw)
-            unique_keywords.append(kw)
+    # Simple keyword extraction - words that are not common stop words.
+    # A keyword is a run of word characters made only of ASCII letters, so
+    # blank out ASCII separators and split instead of running _WORD_RE.
+    words = []
+    for token in text.lower().translate(_ASCII_SEPARATORS).split():
+        if token.isascii():
+            if token.isalpha():
+                words.append(token)
+        else:
+            # Non-ASCII separators or letters: defer to the regex
+            words.extend(_WORD_RE.findall(token))
     
-    return unique_keywords
+    # dict.fromkeys removes duplicates while preserving order
+    return [
+        w for w in dict.fromkeys(words)
+        if len(w) >= min_length and w not in _STOP_WORDS
+    ]
 
 
 def sanitize_filename(text: str) -> str:
     """Sanitize text for use as filename."""
     # Replace invalid characters with underscore
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', text)
+    sanitized = _FNAME_RE.sub('_', text)
     # Remove leading/trailing dots and spaces
     sanitized = sanitized.strip('. ')
     # Limit length
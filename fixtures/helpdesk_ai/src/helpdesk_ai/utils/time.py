@@ -3,64 +3,100 @@ Time utility functions.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, List, Optional
+
+
+DEFAULT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (exclusive threshold, divisor, unit) for time_ago, largest unit first;
+# day-based units apply to timedelta.days, the rest to timedelta.seconds
+_DAY_UNITS = ((365, 365, "year"), (30, 30, "month"), (0, 1, "day"))
+_SECOND_UNITS = ((3600, 3600, "hour"), (60, 60, "minute"))
+
+# 1 for each business hour of the week, indexed by weekday * 24 + hour
+_BUSINESS_HOURS = bytes(
+    1 if weekday < 5 and 9 <= hour < 17 else 0
+    for weekday in range(7)
+    for hour in range(24)
+)
 
 
 def format_timestamp(dt: datetime, format_str: Optional[str] = None) -> str:
     """Format datetime to string."""
-    if format_str is None:
-        format_str = "%Y-%m-%d %H:%M:%S"
-    return dt.strftime(format_str)
+    if (format_str is None or format_str == DEFAULT_FORMAT) and dt.year >= 1000:
+        # Plain integer formatting of the default layout; strftime would
+        # re-interpret the format string on every call. (strftime does not
+        # zero-pad years below 1000, so those keep using it.)
+        return (
+            f"{dt.year}-{dt.month:02d}-{dt.day:02d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+        )
+    return dt.strftime(format_str or DEFAULT_FORMAT)
 
 
 def parse_timestamp(timestamp_str: str, format_str: Optional[str] = None) -> datetime:
     """Parse string to datetime."""
     if format_str is None:
-        # Try ISO format first
+        # Try ISO format first. fromisoformat accepts a space separator, so
+        # this also covers DEFAULT_FORMAT; strptime only sees the leftovers
+        # (e.g. unpadded fields).
         try:
             return datetime.fromisoformat(timestamp_str)
         except ValueError:
-            format_str = "%Y-%m-%d %H:%M:%S"
+            format_str = DEFAULT_FORMAT
     
     return datetime.strptime(timestamp_str, format_str)
 
 
 def time_ago(dt: datetime) -> str:
     """Get human-readable time ago string."""
-    delta = datetime.now() - dt
-    
-    if delta.days > 365:
-        years = delta.days // 365
-        return f"{years} year{'s' if years != 1 else ''} ago"
-    elif delta.days > 30:
-        months = delta.days // 30
-        return f"{months} month{'s' if months != 1 else ''} ago"
-    elif delta.days > 0:
-        return f"{delta.days} day{'s' if delta.days != 1 else ''} ago"
-    elif delta.seconds > 3600:
-        hours = delta.seconds // 3600
-        return f"{hours} hour{'s' if hours != 1 else ''} ago"
-    elif delta.seconds > 60:
-        minutes = delta.seconds // 60
-        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-    else:
-        return "just now"
+    return _format_ago(datetime.now() - dt)
+
+
+def time_ago_batch(dts: Iterable[datetime]) -> List[str]:
+    """Get time ago strings for many datetimes against a single now."""
+    now = datetime.now()
+    return [_format_ago(now - dt) for dt in dts]
+
+
+def _format_ago(delta: timedelta) -> str:
+    """Render a delta with the first unit whose threshold it exceeds."""
+    days = delta.days
+    for threshold, divisor, unit in _DAY_UNITS:
+        if days > threshold:
+            count = days // divisor
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    seconds = delta.seconds
+    for threshold, divisor, unit in _SECOND_UNITS:
+        if seconds > threshold:
+            count = seconds // divisor
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return "just now"
 
 
 def is_business_hours(dt: datetime) -> bool:
     """Check if datetime is within business hours (9 AM - 5 PM, Mon-Fri)."""
-    if dt.weekday() >= 5:  # Saturday or Sunday
-        return False
-    return 9 <= dt.hour < 17
+    return _BUSINESS_HOURS[dt.weekday() * 24 + dt.hour] == 1
 
 
 def add_business_days(dt: datetime, days: int) -> datetime:
-    """Add business days to a datetime."""
-    current = dt
-    added = 0
-    while added < days:
-        current += timedelta(days=1)
-        if is_business_hours(current):
-            added += 1
-    return current
-
+    """
+    Add business days (Mon-Fri) to a datetime, keeping the time of day.
+    
+    Computed arithmetically: every 5 business days is one calendar week,
+    and the remainder only needs to know whether it crosses a weekend.
+    """
+    if days <= 0:
+        return dt
+    weekday = dt.weekday()
+    offset = 0
+    if weekday >= 5:
+        # From a weekend day the next business day is Monday, exactly as
+        # from the preceding Friday
+        offset = 4 - weekday
+        weekday = 4
+    weeks, remainder = divmod(days, 5)
+    offset += 7 * weeks + remainder
+    if remainder and weekday + remainder > 4:
+        offset += 2
+    return dt + timedelta(days=offset)
@@ -2,8 +2,13 @@
 Minimal web application skeleton for helpdesk service.
 """
 
-from typing import Dict, Any, Optional
-from .handlers import TicketHandler, HealthHandler
+from typing import Dict, Any, Mapping, Optional, Callable, Tuple
+from .handlers import TicketHandler, HealthHandler, _canned, _METHOD_NOT_ALLOWED
+
+
+_NOT_FOUND = _canned(404, {"error": "Not found"})
+# Methods whose handler takes the request body
+_BODY_METHODS = frozenset({"POST", "PUT"})
 
 
 class WebApp:
@@ -15,34 +20,30 @@ class WebApp:
             "/health": HealthHandler(),
             "/tickets": TicketHandler(),
         }
+        # (path, method) -> bound handler method, so dispatch is one lookup
+        self._routes: Dict[Tuple[str, str], Callable[..., Mapping[str, Any]]] = {}
+        for path, handler in self.handlers.items():
+            self._routes[(path, "GET")] = handler.get
+            self._routes[(path, "POST")] = handler.post
+            self._routes[(path, "PUT")] = handler.put
+            self._routes[(path, "DELETE")] = handler.delete
+        self._routes[("/tickets/batch", "POST")] = self.handlers["/tickets"].post_batch
+        # Known paths, to tell 404 from 405 on a route miss
+        self._paths = frozenset(path for path, _ in self._routes)
     
-    def handle_request(self, path: str, method: str = "GET", body: Optional[str] = None) -> Dict[str, Any]:
+    def handle_request(self, path: str, method: str = "GET", body: Optional[str] = None) -> Mapping[str, Any]:
         """Handle a web request."""
-        handler = self.handlers.get(path)
-        if not handler:
-            return {
-                "status": 404,
-                "headers": {"Content-Type": "application/json"},
-                "body": '{"error": "Not found"}',
-            }
+        route = self._routes.get((path, method))
+        if route is None:
+            if path not in self._paths:
+                return _NOT_FOUND
+            return _METHOD_NOT_ALLOWED
         
-        if method == "GET":
-            return handler.get()
-        elif method == "POST":
-            return handler.post(body)
-        elif method == "PUT":
-            return handler.put(body)
-        elif method == "DELETE":
-            return handler.delete()
-        else:
-            return {
-                "status": 405,
-                "headers": {"Content-Type": "application/json"},
-                "body": '{"error": "Method not allowed"}',
-            }
+        if method in _BODY_METHODS:
+            return route(body)
+        return route()
 
 
 def create_app() -> WebApp:
     """Create and configure web application."""
     return WebApp()
-
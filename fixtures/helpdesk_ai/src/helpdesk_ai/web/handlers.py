@@ -3,58 +3,106 @@ Request handlers for web interface.
 """
 
 import json
-from typing import Dict, Any, Optional
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..store.memory_store import MemoryStore
 from ..services.triage import TriageService
-from ..cli import create_default_triage_service
+from ..cli import get_default_triage_service, triage_records
+
+
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps_bytes = orjson.dumps
+
+    def _dumps(data: Any) -> str:
+        return orjson.dumps(data).decode("utf-8")
+else:
+    _loads = json.loads
+
+    def _dumps_bytes(data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    _dumps = json.dumps
+
+
+_JSON_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+
+
+def _response(status: int, body: str) -> Dict[str, Any]:
+    """Build a JSON response dict."""
+    return {
+        "status": status,
+        "headers": _JSON_HEADERS,
+        "body": body,
+    }
+
+
+def _canned(status: int, data: Any) -> Mapping[str, Any]:
+    """Build a read-only response once, to be returned by reference."""
+    return MappingProxyType(_response(status, _dumps(data)))
+
+
+# Static responses, built once at import. Handlers return these shared
+# read-only mappings; callers that need to mutate one must copy it.
+_METHOD_NOT_ALLOWED = _canned(405, {"error": "Method not allowed"})
+_BODY_REQUIRED = _canned(400, {"error": "Request body required"})
+_INVALID_JSON = _canned(400, {"error": "Invalid JSON"})
+_HEALTHY = _canned(200, {"status": "healthy"})
+_ARRAY_REQUIRED = _canned(400, {"error": "Request body must be a JSON array"})
+_CREATED_PREFIX = _dumps({"message": "Ticket created", "data": None})[:-len("null}")]
+
+
+# Process-wide ticket store and triage service shared by every handler,
+# built on first use so rule/regex setup is paid once per process
+_services: Optional[Tuple[MemoryStore, TriageService]] = None
+_services_lock = threading.Lock()
+
+
+def _get_services() -> Tuple[MemoryStore, TriageService]:
+    """Return the shared (store, triage_service) pair."""
+    global _services
+    services = _services
+    if services is None:
+        with _services_lock:
+            services = _services
+            if services is None:
+                services = _services = (MemoryStore(), get_default_triage_service())
+    return services
 
 
 class Handler:
     """Base handler class."""
     
-    def get(self) -> Dict[str, Any]:
+    def get(self) -> Mapping[str, Any]:
         """Handle GET request."""
-        return {
-            "status": 405,
-            "headers": {"Content-Type": "application/json"},
-            "body": '{"error": "Method not allowed"}',
-        }
+        return _METHOD_NOT_ALLOWED
     
-    def post(self, body: Optional[str] = None) -> Dict[str, Any]:
+    def post(self, body: Optional[str] = None) -> Mapping[str, Any]:
         """Handle POST request."""
-        return {
-            "status": 405,
-            "headers": {"Content-Type": "application/json"},
-            "body": '{"error": "Method not allowed"}',
-        }
+        return _METHOD_NOT_ALLOWED
     
-    def put(self, body: Optional[str] = None) -> Dict[str, Any]:
+    def put(self, body: Optional[str] = None) -> Mapping[str, Any]:
         """Handle PUT request."""
-        return {
-            "status": 405,
-            "headers": {"Content-Type": "application/json"},
-            "body": '{"error": "Method not allowed"}',
-        }
+        return _METHOD_NOT_ALLOWED
     
-    def delete(self) -> Dict[str, Any]:
+    def delete(self) -> Mapping[str, Any]:
         """Handle DELETE request."""
-        return {
-            "status": 405,
-            "headers": {"Content-Type": "application/json"},
-            "body": '{"error": "Method not allowed"}',
-        }
+        return _METHOD_NOT_ALLOWED
 
 
 class HealthHandler(Handler):
     """Health check handler."""
     
-    def get(self) -> Dict[str, Any]:
+    def get(self) -> Mapping[str, Any]:
         """Handle health check request."""
-        return {
-            "status": 200,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"status": "healthy"}),
-        }
+        return _HEALTHY
 
 
 class TicketHandler(Handler):
@@ -62,41 +110,60 @@ class TicketHandler(Handler):
     
     def __init__(self):
         """Initialize ticket handler."""
-        self.store = MemoryStore()
-        self.triage_service = create_default_triage_service()
+        self.store, self.triage_service = _get_services()
     
-    def get(self) -> Dict[str, Any]:
+    def get(self) -> Mapping[str, Any]:
         """Get all tickets."""
-        tickets = self.store.list_all()
-        tickets_data = [t.to_dict() for t in tickets]
-        return {
-            "status": 200,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"tickets": tickets_data}),
-        }
+        # Encode ticket by ticket into one buffer straight off the store, so
+        # neither a ticket list nor a list of ticket dicts is materialized
+        buf = bytearray(b'{"tickets":[')
+        for ticket in self.store.iter_all():
+            buf += _dumps_bytes(ticket.to_dict())
+            buf += b","
+        if buf[-1] == 0x2C:
+            del buf[-1]
+        buf += b"]}"
+        return _response(200, buf.decode("utf-8"))
     
-    def post(self, body: Optional[str] = None) -> Dict[str, Any]:
-        """Create a new ticket."""
+    def post(self, body: Optional[Union[str, bytes]] = None) -> Mapping[str, Any]:
+        """Create a new ticket. The body may be str or raw UTF-8 bytes."""
         if not body:
-            return {
-                "status": 400,
-                "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({"error": "Request body required"}),
-            }
+            return _BODY_REQUIRED
         
         try:
-            data = json.loads(body)
-            # In a real implementation, we'd parse, validate, normalize, and triage here
-            # For this skeleton, we just return a success response
-            return {
-                "status": 201,
-                "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({"message": "Ticket created", "data": data}),
-            }
-        except json.JSONDecodeError:
-            return {
-                "status": 400,
-                "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({"error": "Invalid JSON"}),
-            }
-
+            # Parsed only to validate it; the echo below reuses the raw text
+            _loads(body)
+            if isinstance(body, bytes):
+                body = body.decode("utf-8")
+        except ValueError:
+            # json.JSONDecodeError and orjson.JSONDecodeError are both
+            # ValueErrors, as is a bytes body that is not UTF-8
+            return _INVALID_JSON
+        
+        # In a real implementation, we'd parse, validate, normalize, and triage here
+        # For this skeleton, we just return a success response. The request
+        # body is already valid JSON, so it is spliced in rather than
+        # re-serialized from the parsed objects.
+        return _response(201, _CREATED_PREFIX + body + "}")
+    
+    def post_batch(self, body: Optional[Union[str, bytes]] = None) -> Mapping[str, Any]:
+        """
+        Triage a JSON array of tickets in one request.
+        
+        The body is parsed once and the records go through the batch
+        validate/normalize/triage pipeline together. Invalid records are
+        reported per index without failing the rest.
+        """
+        if not body:
+            return _BODY_REQUIRED
+        
+        try:
+            records = _loads(body)
+        except ValueError:
+            return _INVALID_JSON
+        if not isinstance(records, list):
+            return _ARRAY_REQUIRED
+        
+        results = triage_records(records, self.triage_service)
+        failures = sum(1 for result in results if "error" in result)
+        return _response(200, _dumps({"results": results, "failures": failures}))
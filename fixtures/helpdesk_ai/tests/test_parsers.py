@@ -5,7 +5,7 @@ These tests expose bugs in validation logic.
 """
 
 import pytest
-from helpdesk_ai.ingest.parsers import JSONParser, CSVParser, TextParser
+from helpdesk_ai.ingest.parsers import JSONParser, CSVParser, TextParser, MultiFormatParser
 from helpdesk_ai.ingest.validators import TicketValidator, ValidationError
 from helpdesk_ai.ingest.normalize import TicketNormalizer
 
@@ -122,3 +122,16 @@ def test_csv_parser():
     assert result["ticket_id"] == "TKT-001"
     assert result["title"] == "Test"
 
+
+
+def test_multi_format_parser_sniffs_format():
+    """Test that each format is routed to its parser."""
+    parser = MultiFormatParser()
+    
+    assert parser.parse('{"ticket_id": "TKT-001"}') == {"ticket_id": "TKT-001"}
+    assert parser.parse("ticket_id,title\nTKT-001,Test") == {"ticket_id": "TKT-001", "title": "Test"}
+    assert parser.parse("time:stamp,title\n1,Broken") == {"time:stamp": "1", "title": "Broken"}
+    assert parser.parse("Title: Test\nDescription: line one\nDescription: line two") == {
+        "title": "Test",
+        "description": "line one\nline two",
+    }
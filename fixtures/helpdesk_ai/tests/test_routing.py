@@ -125,3 +125,43 @@ def test_router_default_assignment():
     assert result.assigned_to == "tech-team"
     assert result.priority == Priority.MEDIUM
 
+
+
+def test_memory_store_search_sees_in_place_changes():
+    """Tickets changed after save() are found under their current values."""
+    from helpdesk_ai.domain.rules import Rule
+    from helpdesk_ai.services.escalation import EscalationService
+    from helpdesk_ai.store.memory_store import MemoryStore
+    
+    store = MemoryStore()
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Cannot log in",
+        description="Login fails",
+        requester_email="user@example.com",
+        category=Category.ACCOUNT,
+        priority=Priority.HIGH,
+    )
+    store.save(ticket)
+    
+    # Escalation assigns fields directly
+    EscalationService().escalate(ticket)
+    assert store.search(priority=Priority.CRITICAL) == [ticket]
+    assert store.search(priority=Priority.HIGH) == []
+    
+    # Routing changes the ticket through update()
+    rule_engine = RuleEngine()
+    rule_engine.add_rule(Rule(
+        rule_id="account_rule",
+        name="Account Rule",
+        priority=Priority.HIGH,
+        condition=lambda t: t.category is Category.ACCOUNT,
+        target_assignee="account-team",
+    ))
+    Router(rule_engine).route(ticket)
+    assert store.search(assigned_to="account-team") == [ticket]
+    
+    # A replaced or deleted ticket no longer affects the store
+    store.delete(ticket.ticket_id)
+    ticket.priority = Priority.LOW
+    assert store.search(priority=Priority.LOW) == []
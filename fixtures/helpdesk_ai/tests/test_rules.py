@@ -138,3 +138,263 @@ def test_multiple_matching_rules():
     highest = rule_engine.get_highest_priority_match(ticket)
     assert highest.priority == Priority.CRITICAL
 
+
+
+def test_raising_condition_does_not_stop_matching():
+    """A condition that raises is a miss; later rules are still evaluated."""
+    rule_engine = RuleEngine()
+    
+    rule_engine.add_rule(Rule(
+        rule_id="broken_rule",
+        name="Broken Rule",
+        priority=Priority.HIGH,
+        condition=lambda t: t.missing_field,
+    ))
+    
+    rule_engine.add_rule(Rule(
+        rule_id="general_rule",
+        name="General Rule",
+        priority=Priority.LOW,
+        condition=lambda t: t.category == Category.GENERAL,
+    ))
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Test ticket",
+        description="Test description",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    matches = rule_engine.get_matching_rules(ticket)
+    assert [r.rule_id for r in matches] == ["general_rule"]
+    assert [m.rule_id for m in rule_engine.iter_matches(ticket)] == ["general_rule"]
+
+
+def test_predicates_prune_candidates():
+    """Rules indexed by category/keyword only run for matching tickets."""
+    rule_engine = RuleEngine()
+    calls = []
+    
+    rule_engine.add_rule(Rule(
+        rule_id="billing_rule",
+        name="Billing Rule",
+        priority=Priority.HIGH,
+        condition=lambda t: calls.append("billing") or True,
+        predicates={"category": Category.BILLING},
+    ))
+    
+    rule_engine.add_rule(Rule(
+        rule_id="refund_rule",
+        name="Refund Rule",
+        priority=Priority.MEDIUM,
+        condition=lambda t: calls.append("refund") or True,
+        predicates={"keyword": "refund"},
+    ))
+    
+    rule_engine.add_rule(Rule(
+        rule_id="catch_all",
+        name="Catch All",
+        priority=Priority.LOW,
+        condition=lambda t: True,
+    ))
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Need a REFUND",
+        description="Charged twice",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    matches = rule_engine.get_matching_rules(ticket)
+    assert [r.rule_id for r in matches] == ["refund_rule", "catch_all"]
+    assert calls == ["refund"]
+
+
+def test_matches_refresh_after_ticket_update():
+    """Cached matches are invalidated when the ticket is updated."""
+    rule_engine = RuleEngine()
+    
+    rule_engine.add_rule(Rule(
+        rule_id="billing_rule",
+        name="Billing Rule",
+        priority=Priority.HIGH,
+        condition=lambda t: t.category == Category.BILLING,
+    ))
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Test ticket",
+        description="Test description",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    assert rule_engine.get_matching_rules(ticket) == []
+    
+    ticket.update(category=Category.BILLING)
+    
+    assert [r.rule_id for r in rule_engine.get_matching_rules(ticket)] == ["billing_rule"]
+    assert rule_engine.get_rule("billing_rule").name == "Billing Rule"
+
+
+def test_remove_rule_keeps_registration_order():
+    """Removing a rule leaves the remaining rules in registration order."""
+    rule_engine = RuleEngine()
+    
+    for rule_id in ["first", "second", "third"]:
+        rule_engine.add_rule(Rule(
+            rule_id=rule_id,
+            name=rule_id,
+            priority=Priority.MEDIUM,
+            condition=lambda t: True,
+        ))
+    
+    assert rule_engine.remove_rule("second") is True
+    assert rule_engine.remove_rule("second") is False
+    assert [r.rule_id for r in rule_engine.rules] == ["first", "third"]
+    assert rule_engine.get_rule("second") is None
+    # rules is a read-only view; appending must fail rather than be dropped
+    with pytest.raises(AttributeError):
+        rule_engine.rules.append(rule_engine.get_rule("first"))
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Test ticket",
+        description="Test description",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    assert rule_engine.get_highest_priority_match(ticket).rule_id == "first"
+
+
+def test_predicates_accept_collections():
+    """Rules indexed under several categories/keywords run once per ticket."""
+    rule_engine = RuleEngine()
+    calls = []
+    
+    rule_engine.add_rule(Rule(
+        rule_id="money_rule",
+        name="Money Rule",
+        priority=Priority.HIGH,
+        condition=lambda t: calls.append("money") or True,
+        predicates={"keyword": ("refund", "charged")},
+    ))
+    
+    rule_engine.add_rule(Rule(
+        rule_id="account_rule",
+        name="Account Rule",
+        priority=Priority.MEDIUM,
+        condition=lambda t: True,
+        predicates={"category": {Category.ACCOUNT, Category.BILLING}},
+    ))
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Need a refund",
+        description="Charged twice",
+        requester_email="test@example.com",
+        category=Category.BILLING,
+    )
+    
+    matches = rule_engine.get_matching_rules(ticket)
+    assert [r.rule_id for r in matches] == ["money_rule", "account_rule"]
+    assert calls == ["money"]
+    
+    assert rule_engine.remove_rule("account_rule")
+    ticket.update(category=Category.ACCOUNT)
+    assert [r.rule_id for r in rule_engine.get_matching_rules(ticket)] == ["money_rule"]
+
+
+def test_highest_priority_match_stops_at_first_hit():
+    """Rules are tried most urgent first; less urgent ones are not evaluated."""
+    rule_engine = RuleEngine()
+    calls = []
+    
+    for rule_id, priority in [("low", Priority.LOW), ("high", Priority.HIGH), ("critical", Priority.CRITICAL)]:
+        rule_engine.add_rule(Rule(
+            rule_id=rule_id,
+            name=rule_id,
+            priority=priority,
+            condition=lambda t, rule_id=rule_id: calls.append(rule_id) or rule_id != "critical",
+        ))
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Test ticket",
+        description="Test description",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    assert rule_engine.get_highest_priority_match(ticket).rule_id == "high"
+    assert calls == ["critical", "high"]
+
+
+def test_matches_follow_ticket_updates():
+    """Memoized matches are per ticket object and refreshed by update()."""
+    from helpdesk_ai.services.escalation import EscalationService
+    
+    rule_engine = RuleEngine()
+    rule_engine.add_rule(Rule(
+        rule_id="critical_rule",
+        name="Critical Rule",
+        priority=Priority.CRITICAL,
+        condition=lambda t: t.priority is Priority.CRITICAL,
+    ))
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Test ticket",
+        description="Test description",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+        priority=Priority.HIGH,
+    )
+    twin = Ticket(
+        ticket_id=ticket.ticket_id,
+        title=ticket.title,
+        description=ticket.description,
+        requester_email=ticket.requester_email,
+        category=ticket.category,
+        priority=Priority.CRITICAL,
+        created_at=ticket.created_at,
+        updated_at=ticket.updated_at,
+    )
+    
+    assert rule_engine.get_matching_rules(ticket) == []
+    assert rule_engine.get_highest_priority_match(ticket) is None
+    # Same id and timestamps, different object: not served from ticket's entry
+    assert rule_engine.get_highest_priority_match(twin).rule_id == "critical_rule"
+    
+    # escalate() changes priority and status through update()
+    EscalationService().escalate(ticket)
+    assert [r.rule_id for r in rule_engine.get_matching_rules(ticket)] == ["critical_rule"]
+    assert rule_engine.get_highest_priority_match(ticket).rule_id == "critical_rule"
+
+
+def test_rule_match_follows_renamed_rule():
+    """Shared match results pick up a rule's reassigned name."""
+    rule_engine = RuleEngine()
+    rule = Rule(
+        rule_id="always",
+        name="Original",
+        priority=Priority.MEDIUM,
+        condition=lambda t: True,
+    )
+    rule_engine.add_rule(rule)
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Test ticket",
+        description="Test description",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    assert rule_engine.evaluate(ticket)[0].rule_name == "Original"
+    rule.name = "Renamed"
+    assert rule_engine.evaluate(ticket)[0].rule_name == "Renamed"
+    assert [m.rule_name for m in rule_engine.iter_matches(ticket)] == ["Renamed"]
@@ -6,7 +6,9 @@ These tests expose bugs in scoring normalization.
 
 import pytest
 from helpdesk_ai.domain.models import Ticket, Category, Priority
-from helpdesk_ai.domain.scoring import WeightedScorer, PriorityScorer, UrgencyScorer, Score
+from helpdesk_ai.domain.scoring import (
+    WeightedScorer, PriorityScorer, UrgencyScorer, CompositeScorer, Score,
+)
 
 
 def test_priority_scorer():
@@ -169,3 +171,78 @@ def test_urgency_scorer():
     assert score.total > 0
     assert score.normalized is not None
 
+
+
+def test_score_repr():
+    """Test that Score renders with and without a normalized value."""
+    assert repr(Score(total=7.0, components={})) == "Score(total=7.00, normalized=None)"
+    assert repr(Score(total=7.0, components={}, normalized=0.7)) == "Score(total=7.00, normalized=0.70)"
+
+
+def test_score_batch_matches_score():
+    """Test that batch scoring agrees with scoring one ticket at a time."""
+    tickets = [
+        Ticket(
+            ticket_id=f"TKT-00{i}",
+            title=title,
+            description="Critical error occurred",
+            requester_email="test@example.com",
+            category=Category.GENERAL,
+            priority=priority,
+        )
+        for i, (title, priority) in enumerate([
+            ("Urgent: System down", Priority.CRITICAL),
+            ("Question", Priority.LOW),
+        ])
+    ]
+    
+    scorer = WeightedScorer(
+        scorers={"priority": lambda t: 2.0, "title": lambda t: float(len(t.title))},
+        weights={"priority": 0.5},
+    )
+    
+    composite = CompositeScorer([PriorityScorer(), UrgencyScorer()], weights=[2.0, 1.0])
+    
+    for s in (scorer, PriorityScorer(), UrgencyScorer(), composite):
+        assert s.score_batch(tickets) == [s.score(t) for t in tickets]
+
+
+def test_weighted_scorer_sees_in_place_edits():
+    """Edits to the scorers/weights dicts apply to the next score."""
+    scorer = WeightedScorer(
+        scorers={"a": lambda t: 1.0, "b": lambda t: 2.0},
+        normalize=False,
+    )
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Test ticket",
+        description="Test description",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    assert scorer.score(ticket).total == 3.0
+    scorer.weights["b"] = 10.0
+    assert scorer.score(ticket).total == 21.0
+    scorer.scorers["c"] = lambda t: 5.0
+    assert scorer.score_batch([ticket])[0].total == 26.0
+
+
+def test_urgency_keywords_are_case_insensitive():
+    """Test that mixed-case keywords match lowercased ticket text, including added ones."""
+    scorer = UrgencyScorer(urgency_keywords=["Outage", "DOWN"])
+    
+    ticket = Ticket(
+        ticket_id="TKT-001",
+        title="Outage",
+        description="Everything is down",
+        requester_email="test@example.com",
+        category=Category.GENERAL,
+    )
+    
+    assert scorer.score(ticket).total == 4.0
+    
+    scorer.urgency_keywords.append("everything")
+    assert scorer.score(ticket).total == 6.0
+    assert scorer.score_batch([ticket])[0].total == 6.0
@@ -18,8 +18,8 @@ from agent_driver import (
     load_tasks,
     execute_lookups,
     build_step_prompt_treatment,
-    count_tokens,
     debug_log,
+    bound_output,
     SnippetTracker,
     STEP_NAMES,
 )
@@ -52,23 +52,23 @@ def execute_task(
     
     # Count new vs reused snippets BEFORE recording
     for l in lookups:
-        if tracker.has_seen(l["snippet_id"]):
+        if tracker.has_seen(l["snippet_digest"]):
             task_metrics["reused_snippets"] += 1
         else:
             task_metrics["new_snippets"] += 1
     
     for step_name in STEP_NAMES:
         # Build prompt with deduplication
-        prompt = build_step_prompt_treatment(
+        prompt, prompt_bytes = build_step_prompt_treatment(
             task_idx, task_text, step_name, lookups, prior_outputs, tracker
         )
         
-        client_sent_tokens = count_tokens(prompt)
+        client_sent_tokens = prompt_bytes // 4
         
         # Estimate snippet tokens actually sent (new only)
         new_snippet_tokens = sum(
             l["token_estimate"] for l in lookups 
-            if not tracker.has_seen(l["snippet_id"])
+            if not tracker.has_seen(l["snippet_digest"])
         )
         
         debug_log(task_idx, step_name, prompt, task_metrics["snippet_ids"])
@@ -82,7 +82,7 @@ def execute_task(
         )
         
         output_text = output_bytes.decode('utf-8', errors='replace')
-        prior_outputs.append(output_text)
+        prior_outputs.append(bound_output(output_text))
         
         step_metrics = {
             "step_name": step_name,
@@ -13,33 +13,45 @@ import hashlib
 import json
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 from fixture_loader import load_fixture
 
-# Cache fixture content (loaded once per process)
-_fixture_cache: Optional[str] = None
-_fixture_tokens: int = 0
+FIXTURE_DIR = "fixtures/helpdesk_ai"
 
 
-def _get_fixture_content() -> tuple:
-    """Load fixture content once, cache for reuse. Returns (text, token_estimate)."""
-    global _fixture_cache, _fixture_tokens
-    if _fixture_cache is None:
-        content, total_bytes, file_count = load_fixture("fixtures/helpdesk_ai")
-        _fixture_cache = content
-        # Rough token estimate: ~4 bytes per token
-        _fixture_tokens = len(content.encode('utf-8')) // 4
-    return _fixture_cache, _fixture_tokens
+def _init_fixture() -> Tuple[str, int, str]:
+    """
+    Load the fixture and derive its token estimate and hash.
+    
+    Runs once at import, so the getters below never re-encode or re-hash
+    the ~26K-token fixture. An unreadable fixture yields empty content.
+    """
+    try:
+        text, _, _ = load_fixture(FIXTURE_DIR)
+    except OSError:
+        text = ""
+    data = text.encode('utf-8')
+    # Rough token estimate: ~4 bytes per token
+    return text, len(data) // 4, hashlib.sha256(data).hexdigest()[:16]
+
+
+_FIXTURE_TEXT, _FIXTURE_TOKENS, _CONTRACT_HASH = _init_fixture()
+
+
+def _get_fixture_content() -> Tuple[str, int]:
+    """Return the fixture content precomputed at import as (text, token_estimate)."""
+    return _FIXTURE_TEXT, _FIXTURE_TOKENS
 
 
 def get_contract_hash() -> str:
     """Generate stable contract hash for session identification."""
-    fixtures, _ = _get_fixture_content()
-    return hashlib.sha256(fixtures.encode('utf-8')).hexdigest()[:16]
+    return _CONTRACT_HASH
 
 
+@lru_cache(maxsize=4)
 def build_warmup_prompt(fixtures_ref: str = "fixtures/helpdesk_ai") -> str:
     """
     Build warmup prompt for treatment mode.
@@ -47,14 +59,18 @@ def build_warmup_prompt(fixtures_ref: str = "fixtures/helpdesk_ai") -> str:
     Warmup sends full fixtures ONCE. LE-0 returns an opaque context_handle
     that references the retained context server-side.
     
+    The prompt depends only on fixtures_ref and the fixture state loaded at
+    import, so it is memoized per fixtures_ref; call
+    build_warmup_prompt.cache_clear() after reloading the fixture.
+    
     Args:
         fixtures_ref: Reference path to fixtures (for documentation)
     
     Returns:
         Complete warmup prompt with full fixtures
     """
-    fixtures_text, _ = _get_fixture_content()
-    contract_hash = get_contract_hash()
+    fixtures_text = _FIXTURE_TEXT
+    contract_hash = _CONTRACT_HASH
     
     return f"""## Session Warmup
 
@@ -89,33 +105,11 @@ def build_step_prompt_baseline(
     Returns:
         Complete prompt with full fixtures
     """
-    fixtures_text, _ = _get_fixture_content()
-    
-    prompt_parts = []
-    
     # Full fixtures (sent every step in baseline)
-    prompt_parts.append(f"## Codebase to Analyze\n\n{fixtures_text}")
-    
-    # Prior step outputs (bounded)
-    if prior_outputs:
-        accumulated = ""
-        step_labels = ["Planner", "Executor", "Verifier"]
-        for i, output in enumerate(prior_outputs):
-            label = step_labels[i] if i < len(step_labels) else f"Step {i+1}"
-            # Bound prior output to first 2000 chars to prevent unbounded growth
-            bounded_output = output[:2000] + "..." if len(output) > 2000 else output
-            accumulated += f"\n\n### {label} Output\n\n{bounded_output}"
-        if accumulated:
-            prompt_parts.append(f"## Previous Analysis{accumulated}")
-    
-    # Step instruction
-    instruction = _get_step_instruction(step_name)
-    prompt_parts.append(f"## Current Task\n\n{instruction}")
-    
-    # User task
-    prompt_parts.append(f"## Original Request\n\n{task}")
-    
-    return "\n\n".join(prompt_parts)
+    return "\n\n".join((
+        f"## Codebase to Analyze\n\n{_FIXTURE_TEXT}",
+        *_build_common_tail(step_name, task, prior_outputs),
+    ))
 
 
 def build_step_prompt_treatment(
@@ -139,36 +133,50 @@ def build_step_prompt_treatment(
     Returns:
         Compact prompt with handle reference
     """
-    prompt_parts = []
-    
     # Opaque handle reference (NOT full fixtures)
-    prompt_parts.append(f"## Context Reference\n\nContext Handle: {context_handle}\n\nNote: Full codebase is retained server-side via the handle above.")
-    
-    # Prior step outputs (bounded)
-    if prior_outputs:
-        accumulated = ""
-        step_labels = ["Planner", "Executor", "Verifier"]
-        for i, output in enumerate(prior_outputs):
-            label = step_labels[i] if i < len(step_labels) else f"Step {i+1}"
-            bounded_output = output[:2000] + "..." if len(output) > 2000 else output
-            accumulated += f"\n\n### {label} Output\n\n{bounded_output}"
-        if accumulated:
-            prompt_parts.append(f"## Previous Analysis{accumulated}")
+    return "\n\n".join((
+        f"## Context Reference\n\nContext Handle: {context_handle}\n\nNote: Full codebase is retained server-side via the handle above.",
+        *_build_common_tail(step_name, task, prior_outputs),
+    ))
+
+
+# Labels for prior step outputs, by position in the flow
+_STEP_LABELS = ("Planner", "Executor", "Verifier")
+
+# Prior outputs are bounded to this many chars to prevent unbounded growth
+MAX_PRIOR_OUTPUT_CHARS = 2000
+
+
+def _build_common_tail(
+    step_name: str,
+    task: str,
+    prior_outputs: Optional[List[str]] = None
+) -> Tuple[str, ...]:
+    """
+    Build the prompt sections shared by baseline and treatment.
     
-    # Step instruction
-    instruction = _get_step_instruction(step_name)
-    prompt_parts.append(f"## Current Task\n\n{instruction}")
+    Returns the previous-analysis (when there are prior outputs), current
+    task and original request sections, to be joined by the caller.
+    """
+    parts = []
     
-    # User task
-    prompt_parts.append(f"## Original Request\n\n{task}")
+    # Prior step outputs (bounded), built as pieces and joined once
+    if prior_outputs:
+        sections = [
+            f"\n\n### {_STEP_LABELS[i] if i < len(_STEP_LABELS) else f'Step {i+1}'} Output\n\n"
+            f"{output[:MAX_PRIOR_OUTPUT_CHARS] + '...' if len(output) > MAX_PRIOR_OUTPUT_CHARS else output}"
+            for i, output in enumerate(prior_outputs)
+        ]
+        parts.append("## Previous Analysis" + "".join(sections))
     
-    return "\n\n".join(prompt_parts)
+    parts.append(f"## Current Task\n\n{_get_step_instruction(step_name)}")
+    parts.append(f"## Original Request\n\n{task}")
+    return tuple(parts)
 
 
-def _get_step_instruction(step_name: str) -> str:
-    """Get instruction for a specific step."""
-    instructions = {
-        "planner": """You are analyzing the helpdesk_ai codebase.
+# Per-step instructions, keyed by step name
+_STEP_INSTRUCTIONS: Dict[str, str] = {
+    "planner": """You are analyzing the helpdesk_ai codebase.
 
 Review the codebase structure and create a detailed analysis plan. Your plan should:
 1. Identify the main components and their responsibilities
@@ -178,7 +186,7 @@ Review the codebase structure and create a detailed analysis plan. Your plan sho
 
 Be thorough - your plan will guide the next analysis steps.""",
 
-        "executor": """Based on the analysis plan above, execute the analysis:
+    "executor": """Based on the analysis plan above, execute the analysis:
 
 1. Follow each step from the plan
 2. Document specific findings with file names and line numbers where relevant
@@ -187,7 +195,7 @@ Be thorough - your plan will guide the next analysis steps.""",
 
 Be detailed and specific in your findings.""",
 
-        "verifier": """Review the analysis plan and execution findings above.
+    "verifier": """Review the analysis plan and execution findings above.
 
 1. Verify each finding is accurate and well-supported
 2. Check if all planned analysis steps were completed
@@ -195,32 +203,41 @@ Be detailed and specific in your findings.""",
 4. Provide a final summary with prioritized recommendations
 
 Conclude with a confidence assessment of the analysis quality."""
-    }
-    return instructions.get(step_name, f"Execute step: {step_name}")
+}
+
+
+def _get_step_instruction(step_name: str) -> str:
+    """Get instruction for a specific step."""
+    return _STEP_INSTRUCTIONS.get(step_name, f"Execute step: {step_name}")
 
 
-def count_tokens(text: str) -> int:
-    """Estimate token count (~4 bytes per token)."""
-    return len(text.encode('utf-8')) // 4
+def count_tokens(text: Union[str, bytes]) -> int:
+    """Estimate token count (~4 bytes per token). Accepts text or its UTF-8 bytes."""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return len(text) // 4
 
 
 def get_fixture_token_count() -> int:
     """Get cached fixture token count."""
-    _, tokens = _get_fixture_content()
-    return tokens
+    return _FIXTURE_TOKENS
 
 
-def get_prompt_hash(prompt: str) -> str:
-    """Get SHA256 hash of prompt for verification."""
-    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+def get_prompt_hash(prompt: Union[str, bytes]) -> str:
+    """Get SHA256 hash of prompt for verification. Accepts text or its UTF-8 bytes."""
+    if isinstance(prompt, str):
+        prompt = prompt.encode('utf-8')
+    return hashlib.sha256(prompt).hexdigest()[:16]
 
 
 def debug_log_prompt(mode: str, step_name: str, prompt: str, flow_idx: int = 0) -> None:
     """Log prompt hash to stderr if DEBUG_PROMPTS=1."""
     if os.environ.get("DEBUG_PROMPTS") == "1":
-        prompt_hash = get_prompt_hash(prompt)
-        prompt_len = len(prompt.encode('utf-8'))
-        tokens = count_tokens(prompt)
+        # Encode once; hash, byte length and token count all use the bytes
+        prompt_bytes = prompt.encode('utf-8')
+        prompt_hash = get_prompt_hash(prompt_bytes)
+        prompt_len = len(prompt_bytes)
+        tokens = count_tokens(prompt_bytes)
         print(
             f"[HASH] mode={mode} flow={flow_idx} step={step_name} "
             f"sha256={prompt_hash} bytes={prompt_len} tokens={tokens}",
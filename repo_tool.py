@@ -6,11 +6,15 @@ Returns snippets with stable SHA256-based IDs for deduplication.
 IP-safe: No LE-0 internals, treats runtime as black box.
 """
 
+import ast
 import hashlib
+import heapq
 import os
 import re
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 # Maximum snippet size in characters
 MAX_SNIPPET_SIZE = 2000
@@ -30,44 +34,193 @@ def _load_file(filepath: str) -> str:
     return _file_cache[filepath]
 
 
+# Snippet IDs are the first 8 bytes of the content SHA-256
+SNIPPET_DIGEST_SIZE = 8
+
+
+def _get_snippet_digest(text: Union[str, bytes]) -> bytes:
+    """Generate deterministic raw snippet digest from content (text or UTF-8 bytes)."""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return hashlib.sha256(text).digest()[:SNIPPET_DIGEST_SIZE]
+
+
 def _get_snippet_id(text: str) -> str:
-    """Generate deterministic snippet ID from content."""
-    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+    """Generate deterministic snippet ID (hex of the digest) from content."""
+    return _get_snippet_digest(text).hex()
+
+
+# base_dir -> (lowercase file name, path) for every file, sorted by path
+_dir_listing_cache: Dict[str, List[Tuple[str, str]]] = {}
+
+
+def _scan_files(base_dir: str) -> List[Tuple[str, str]]:
+    """Walk base_dir once, listing its files sorted by path."""
+    return sorted(
+        ((path.name.lower(), str(path)) for path in Path(base_dir).rglob('*') if path.is_file()),
+        key=itemgetter(1),
+    )
 
 
 def _find_files_by_pattern(base_dir: str, pattern: str) -> List[str]:
     """Find files matching a pattern."""
-    base_path = Path(base_dir)
-    matches = []
-    for path in base_path.rglob('*'):
-        if path.is_file() and pattern.lower() in path.name.lower():
-            matches.append(str(path))
-    return sorted(matches)[:5]  # Limit to 5 matches
-
-
-def _extract_function(content: str, func_name: str) -> Optional[Tuple[str, int, int]]:
-    """Extract a function definition from content."""
-    # Match Python function definitions
-    pattern = rf'^(def\s+{re.escape(func_name)}\s*\([^)]*\).*?)(?=\ndef\s|\nclass\s|\Z)'
-    match = re.search(pattern, content, re.MULTILINE | re.DOTALL)
-    if match:
-        func_text = match.group(1).strip()
-        start_line = content[:match.start()].count('\n') + 1
-        end_line = start_line + func_text.count('\n')
-        return func_text[:MAX_SNIPPET_SIZE], start_line, end_line
-    return None
-
-
-def _extract_class(content: str, class_name: str) -> Optional[Tuple[str, int, int]]:
-    """Extract a class definition from content."""
-    pattern = rf'^(class\s+{re.escape(class_name)}\s*[:\(].*?)(?=\nclass\s|\Z)'
-    match = re.search(pattern, content, re.MULTILINE | re.DOTALL)
-    if match:
-        class_text = match.group(1).strip()
-        start_line = content[:match.start()].count('\n') + 1
-        end_line = start_line + class_text.count('\n')
-        return class_text[:MAX_SNIPPET_SIZE], start_line, end_line
-    return None
+    listing = _dir_listing_cache.get(base_dir)
+    if listing is None:
+        listing = _dir_listing_cache[base_dir] = _scan_files(base_dir)
+    pattern = pattern.lower()
+    # The listing is already in path order, so the first 5 hits are the answer
+    return list(islice((path for name, path in listing if pattern in name), 5))
+
+
+class FileSymbols(NamedTuple):
+    """A Python file's lines and its top-level definitions by name."""
+    
+    lines: List[str]
+    # kind ("func" or "class") -> name -> (start_line, end_line); the first
+    # definition of a name wins
+    spans: Dict[str, Dict[str, Tuple[int, int]]]
+
+
+# Like _file_cache and the listing and search caches, the symbol caches
+# live for the whole process: files edited after they were first indexed
+# are not re-read.
+_symbol_index_cache: Dict[str, FileSymbols] = {}
+
+# base_dir -> kind -> name -> (path, start_line, end_line), first file in
+# path order wins
+_dir_symbol_cache: Dict[str, Dict[str, Dict[str, Tuple[str, int, int]]]] = {}
+
+
+def _get_symbol_index(filepath: str) -> FileSymbols:
+    """
+    Index a Python file's top-level functions and classes by name.
+    
+    The file is parsed once per process. A file that does not parse
+    indexes no symbols.
+    """
+    cached = _symbol_index_cache.get(filepath)
+    if cached is not None:
+        return cached
+    
+    content = _load_file(filepath)
+    spans: Dict[str, Dict[str, Tuple[int, int]]] = {"func": {}, "class": {}}
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        tree = None
+    if tree is not None:
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                spans["func"].setdefault(node.name, (node.lineno, node.end_lineno))
+            elif isinstance(node, ast.ClassDef):
+                spans["class"].setdefault(node.name, (node.lineno, node.end_lineno))
+    
+    index = FileSymbols(content.split('\n'), spans)
+    _symbol_index_cache[filepath] = index
+    return index
+
+
+def _get_dir_symbols(base_dir: str) -> Dict[str, Dict[str, Tuple[str, int, int]]]:
+    """Merge the symbol indices of every .py file under base_dir, once per base_dir."""
+    symbols = _dir_symbol_cache.get(base_dir)
+    if symbols is not None:
+        return symbols
+    
+    listing = _dir_listing_cache.get(base_dir)
+    if listing is None:
+        listing = _dir_listing_cache[base_dir] = _scan_files(base_dir)
+    symbols = {"func": {}, "class": {}}
+    for name, path in listing:
+        if not name.endswith(".py"):
+            continue
+        for kind, spans in _get_symbol_index(path).spans.items():
+            merged = symbols[kind]
+            for symbol, (start_line, end_line) in spans.items():
+                merged.setdefault(symbol, (path, start_line, end_line))
+    
+    _dir_symbol_cache[base_dir] = symbols
+    return symbols
+
+
+def _extract_symbol(base_dir: str, kind: str, name: str) -> Optional[Tuple[str, str, int, int]]:
+    """
+    Extract a top-level definition ("func" or "class") from under base_dir.
+    
+    Returns (path, snippet, start_line, end_line), or None if not defined.
+    """
+    found = _get_dir_symbols(base_dir)[kind].get(name)
+    if found is None:
+        return None
+    path, start_line, end_line = found
+    lines = _symbol_index_cache[path].lines
+    text = '\n'.join(lines[start_line - 1:end_line]).strip()
+    return path, text[:MAX_SNIPPET_SIZE], start_line, end_line
+
+
+# Maximal runs of identifier characters in a lowercased line. Any keyword
+# made only of these characters that occurs in a line lies inside one run.
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+# base_dir -> (files as (path, lines), token -> [(file_idx, line_idx)])
+SearchIndex = Tuple[List[Tuple[str, List[str]]], Dict[str, List[Tuple[int, int]]]]
+_search_index_cache: Dict[str, SearchIndex] = {}
+
+
+def _build_search_index(base_dir: str) -> SearchIndex:
+    """
+    Build (once per base_dir) an inverted index of tokens to line positions.
+    
+    Postings are appended in file then line order, so each list is sorted
+    in the order a linear scan of the tree would visit the lines.
+    """
+    cached = _search_index_cache.get(base_dir)
+    if cached is not None:
+        return cached
+    
+    files: List[Tuple[str, List[str]]] = []
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    findall = _TOKEN_RE.findall
+    for file_idx, filepath in enumerate(Path(base_dir).rglob("*.py")):
+        path = str(filepath)
+        lines = _load_file(path).split('\n')
+        files.append((path, lines))
+        for line_idx, line in enumerate(lines):
+            for token in set(findall(line.lower())):
+                postings.setdefault(token, []).append((file_idx, line_idx))
+    
+    cached = _search_index_cache[base_dir] = (files, postings)
+    return cached
+
+
+def _search_lines(base_dir: str, keyword: str, limit: int) -> Tuple[List[Tuple[str, List[str]]], List[Tuple[int, int]]]:
+    """
+    Find the first lines whose lowercase text contains keyword.
+    
+    Returns the indexed files and up to limit (file_idx, line_idx) hits in
+    scan order. Identifier-like keywords are answered from the postings of
+    every token containing them; others fall back to scanning the cached
+    lines.
+    """
+    files, postings = _build_search_index(base_dir)
+    if _TOKEN_RE.fullmatch(keyword):
+        hits: List[Tuple[int, int]] = []
+        merged = heapq.merge(*(positions for token, positions in postings.items() if keyword in token))
+        for position in merged:
+            # A line with several matching tokens appears once per token
+            if not hits or hits[-1] != position:
+                hits.append(position)
+                if len(hits) >= limit:
+                    break
+        return files, hits
+    
+    hits = []
+    for file_idx, (_, lines) in enumerate(files):
+        for line_idx, line in enumerate(lines):
+            if keyword in line.lower():
+                hits.append((file_idx, line_idx))
+                if len(hits) >= limit:
+                    return files, hits
+    return files, hits
 
 
 def _extract_lines(content: str, start: int, end: int) -> Tuple[str, int, int]:
@@ -96,19 +249,23 @@ def repo_lookup(
     Returns:
         {
             "snippet_id": str,      # SHA256-based ID (stable)
+            "snippet_digest": bytes,  # Raw form of snippet_id, for set membership
             "snippet_text": str,    # Actual code content
             "source_path": str,     # File path
             "line_range": [int, int],
             "query": str,           # Original query
+            "snippet_bytes": int,   # UTF-8 length of snippet_text
             "token_estimate": int   # ~4 bytes per token
         }
     """
     result = {
         "snippet_id": "",
+        "snippet_digest": b"",
         "snippet_text": "",
         "source_path": "",
         "line_range": [0, 0],
         "query": query,
+        "snippet_bytes": 0,
         "token_estimate": 0
     }
     
@@ -124,7 +281,8 @@ def repo_lookup(
         matches = _find_files_by_pattern(base_dir, filename)
         if not matches:
             result["snippet_text"] = f"# File not found: {filename}"
-            result["snippet_id"] = _get_snippet_id(result["snippet_text"])
+            result["snippet_digest"] = _get_snippet_digest(result["snippet_text"])
+            result["snippet_id"] = result["snippet_digest"].hex()
             return result
         
         filepath = matches[0]
@@ -151,16 +309,12 @@ def repo_lookup(
         # Function lookup
         func_name = query[5:].strip()
         
-        # Search all Python files
-        for filepath in Path(base_dir).rglob("*.py"):
-            content = _load_file(str(filepath))
-            extracted = _extract_function(content, func_name)
-            if extracted:
-                snippet, start_line, end_line = extracted
-                result["snippet_text"] = snippet
-                result["source_path"] = str(filepath)
-                result["line_range"] = [start_line, end_line]
-                break
+        extracted = _extract_symbol(base_dir, "func", func_name)
+        if extracted:
+            path, snippet, start_line, end_line = extracted
+            result["snippet_text"] = snippet
+            result["source_path"] = path
+            result["line_range"] = [start_line, end_line]
         
         if not result["snippet_text"]:
             result["snippet_text"] = f"# Function not found: {func_name}"
@@ -169,15 +323,12 @@ def repo_lookup(
         # Class lookup
         class_name = query[6:].strip()
         
-        for filepath in Path(base_dir).rglob("*.py"):
-            content = _load_file(str(filepath))
-            extracted = _extract_class(content, class_name)
-            if extracted:
-                snippet, start_line, end_line = extracted
-                result["snippet_text"] = snippet
-                result["source_path"] = str(filepath)
-                result["line_range"] = [start_line, end_line]
-                break
+        extracted = _extract_symbol(base_dir, "class", class_name)
+        if extracted:
+            path, snippet, start_line, end_line = extracted
+            result["snippet_text"] = snippet
+            result["source_path"] = path
+            result["line_range"] = [start_line, end_line]
         
         if not result["snippet_text"]:
             result["snippet_text"] = f"# Class not found: {class_name}"
@@ -187,24 +338,18 @@ def repo_lookup(
         keyword = query[7:].strip().lower()
         matches = []
         
-        for filepath in Path(base_dir).rglob("*.py"):
-            content = _load_file(str(filepath))
-            lines = content.split('\n')
-            for i, line in enumerate(lines):
-                if keyword in line.lower():
-                    # Extract context around match
-                    start = max(0, i - 2)
-                    end = min(len(lines), i + 8)
-                    context = '\n'.join(lines[start:end])
-                    matches.append({
-                        "path": str(filepath),
-                        "line": i + 1,
-                        "context": context[:500]
-                    })
-                    if len(matches) >= 3:
-                        break
-            if len(matches) >= 3:
-                break
+        files, hits = _search_lines(base_dir, keyword, 3)
+        for file_idx, i in hits:
+            path, lines = files[file_idx]
+            # Extract context around match
+            start = max(0, i - 2)
+            end = min(len(lines), i + 8)
+            context = '\n'.join(lines[start:end])
+            matches.append({
+                "path": path,
+                "line": i + 1,
+                "context": context[:500]
+            })
         
         if matches:
             snippet_parts = []
@@ -220,9 +365,13 @@ def repo_lookup(
         # Default: treat as file or keyword search
         result["snippet_text"] = f"# Unknown query format: {query}"
     
-    # Generate stable snippet ID
-    result["snippet_id"] = _get_snippet_id(result["snippet_text"])
-    result["token_estimate"] = len(result["snippet_text"].encode('utf-8')) // 4
+    # Generate stable snippet ID; size is measured once here so downstream
+    # token accounting is a field read rather than another encode
+    snippet_bytes = result["snippet_text"].encode('utf-8')
+    result["snippet_digest"] = _get_snippet_digest(snippet_bytes)
+    result["snippet_id"] = result["snippet_digest"].hex()
+    result["snippet_bytes"] = len(snippet_bytes)
+    result["token_estimate"] = len(snippet_bytes) // 4
     
     return result
 
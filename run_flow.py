@@ -8,15 +8,63 @@ import json
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# Concurrent flow file writes in build_flows()
+WRITE_WORKERS = 8
+
+
 def _progress(msg: str) -> None:
     """Print progress message to stderr unless QUIET=1."""
     if os.environ.get("QUIET") != "1":
         print(f"[PROGRESS] {msg}", file=sys.stderr)
 
 
+# 3-step workflow template
+# Note: The runner will accumulate context by passing previous outputs
+# Step 2 gets: instruction + step1_output
+# Step 3 gets: instruction + step1_output + step2_output
+# This creates growing context that LE-0 can reuse
+STEPS = [
+    {
+        "name": "planner", 
+        "instruction": """You are analyzing the helpdesk_ai codebase located in fixtures/helpdesk_ai/.
+
+Review the codebase structure and create a detailed analysis plan. Your plan should:
+1. Identify the main components and their responsibilities
+2. List specific files to examine for the task
+3. Outline the analysis approach step by step
+4. Note any potential areas of concern
+
+Be thorough - your plan will guide the next analysis steps."""
+    },
+    {
+        "name": "executor", 
+        "instruction": """Based on the analysis plan above, execute the analysis:
+
+1. Follow each step from the plan
+2. Document specific findings with file names and line numbers where relevant
+3. Identify any bugs, issues, or improvements
+4. Provide concrete examples from the code
+
+Be detailed and specific in your findings."""
+    },
+    {
+        "name": "verifier", 
+        "instruction": """Review the analysis plan and execution findings above.
+
+1. Verify each finding is accurate and well-supported
+2. Check if all planned analysis steps were completed
+3. Identify any missed areas or incomplete analysis
+4. Provide a final summary with prioritized recommendations
+
+Conclude with a confidence assessment of the analysis quality."""
+    }
+]
+
+
 def build_flows(num_flows: int = 25) -> None:
     """
     Build expanded flow files using prompts from prompt_suite.json.
@@ -42,52 +90,10 @@ def build_flows(num_flows: int = 25) -> None:
     
     expand_start_time = time.time()
     
-    # 3-step workflow template
-    # Note: The runner will accumulate context by passing previous outputs
-    # Step 2 gets: instruction + step1_output
-    # Step 3 gets: instruction + step1_output + step2_output
-    # This creates growing context that LE-0 can reuse
-    steps = [
-        {
-            "name": "planner", 
-            "instruction": """You are analyzing the helpdesk_ai codebase located in fixtures/helpdesk_ai/.
-
-Review the codebase structure and create a detailed analysis plan. Your plan should:
-1. Identify the main components and their responsibilities
-2. List specific files to examine for the task
-3. Outline the analysis approach step by step
-4. Note any potential areas of concern
-
-Be thorough - your plan will guide the next analysis steps."""
-        },
-        {
-            "name": "executor", 
-            "instruction": """Based on the analysis plan above, execute the analysis:
-
-1. Follow each step from the plan
-2. Document specific findings with file names and line numbers where relevant
-3. Identify any bugs, issues, or improvements
-4. Provide concrete examples from the code
-
-Be detailed and specific in your findings."""
-        },
-        {
-            "name": "verifier", 
-            "instruction": """Review the analysis plan and execution findings above.
-
-1. Verify each finding is accurate and well-supported
-2. Check if all planned analysis steps were completed
-3. Identify any missed areas or incomplete analysis
-4. Provide a final summary with prioritized recommendations
-
-Conclude with a confidence assessment of the analysis quality."""
-        }
-    ]
-    
     _progress(f"Generating {num_flows} flows...")
     
-    total_prompt_bytes = 0
-    for i in range(1, num_flows + 1):
+    def _emit(i: int) -> int:
+        """Write flow i and return its input size in bytes."""
         # Select task prompt (cycle through if needed)
         task_prompt = prompts[(i - 1) % len(prompts)]
         
@@ -100,7 +106,7 @@ This is a Python helpdesk AI system with routing, scoring, validation, and stora
         
         flow = {
             "input": flow_input,
-            "steps": steps
+            "steps": STEPS
         }
         
         # Write expanded flow
@@ -108,7 +114,11 @@ This is a Python helpdesk AI system with routing, scoring, validation, and stora
         with open(output_file, "w") as f:
             json.dump(flow, f, indent=2)
         
-        total_prompt_bytes += len(flow_input.encode('utf-8'))
+        return len(flow_input.encode('utf-8'))
+    
+    # Each flow is its own file, so the writes overlap on a thread pool
+    with ThreadPoolExecutor(max_workers=min(WRITE_WORKERS, num_flows)) as pool:
+        total_prompt_bytes = sum(pool.map(_emit, range(1, num_flows + 1)))
     
     expand_time = time.time() - expand_start_time
     print(f"[TIMING] flow_expansion_ms={expand_time * 1000:.2f}", file=sys.stderr)
@@ -18,8 +18,8 @@ from agent_driver import (
     load_tasks,
     execute_lookups,
     build_step_prompt_baseline,
-    count_tokens,
     debug_log,
+    bound_output,
     STEP_NAMES,
 )
 from target_vllm import run_prompt, _ensure_model_loaded
@@ -45,11 +45,11 @@ def execute_task(task_idx: int, task_text: str) -> dict:
     snippet_tokens = sum(l["token_estimate"] for l in lookups)
     
     for step_name in STEP_NAMES:
-        prompt = build_step_prompt_baseline(
+        prompt, prompt_bytes = build_step_prompt_baseline(
             task_idx, task_text, step_name, lookups, prior_outputs
         )
         
-        client_sent_tokens = count_tokens(prompt)
+        client_sent_tokens = prompt_bytes // 4
         debug_log(task_idx, step_name, prompt, task_metrics["snippet_ids"])
         
         output_bytes, metrics = run_prompt(
@@ -60,7 +60,7 @@ def execute_task(task_idx: int, task_text: str) -> dict:
         )
         
         output_text = output_bytes.decode('utf-8', errors='replace')
-        prior_outputs.append(output_text)
+        prior_outputs.append(bound_output(output_text))
         
         step_metrics = {
             "step_name": step_name,
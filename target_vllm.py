@@ -11,13 +11,14 @@ THIN TARGET CONTRACT:
 IP-safe: Treats LE-0 as a black box. No internal details exposed.
 """
 
+import hashlib
 import os
 import sys
 import time
 import logging
 import warnings
 import atexit
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 
 os.environ.setdefault("VLLM_WORKER_MULTIPROC_METHOD", "spawn")
 os.environ.setdefault("CUDA_VISIBLE_DEVICES", "0")
@@ -42,6 +43,11 @@ warnings.filterwarnings("ignore")
 # Configurable via BENCH_PROFILE
 BENCH_PROFILE = os.environ.get("BENCH_PROFILE", "default")
 
+# Automatic prefix caching: prompts that share a byte-identical leading section
+# (task header + snippets across a task's steps, the shared prefix across tasks)
+# skip re-prefilling it. PREFIX_CACHING=0 disables it.
+PREFIX_CACHING = os.environ.get("PREFIX_CACHING", "1") == "1"
+
 if BENCH_PROFILE == "prefill_dominant":
     # Prefill-dominant: short decode budgets
     STEP_MAX_NEW_TOKENS = {
@@ -197,7 +203,10 @@ def _ensure_model_loaded() -> None:
     old_stdout = sys.stdout
     sys.stdout = io.StringIO()
     try:
-        _llm = LLM(model=_get_model_id(), trust_remote_code=True, disable_log_stats=True, max_model_len=65536)
+        _llm = LLM(
+            model=_get_model_id(), trust_remote_code=True, disable_log_stats=True, max_model_len=65536,
+            enable_prefix_caching=PREFIX_CACHING,
+        )
     finally:
         sys.stdout = old_stdout
     init_ms = (time.time() - start_time) * 1000
@@ -219,67 +228,27 @@ def _count_tokens(text: str) -> int:
         return len(text.encode('utf-8')) // 4
 
 
-def run_prompt(
-    prompt: str,
-    step_name: str,
-    flow_idx: int = 1,
-    max_tokens: int = None,
-    temperature: float = 0.7,
-    is_warmup: bool = False
-) -> Tuple[bytes, Dict[str, Any]]:
-    """
-    Run vLLM generation with TTFT-based prefill/decode timing breakdown.
-    
-    Args:
-        prompt: Pre-built prompt string
-        step_name: Name of step for logging
-        flow_idx: Flow index for logging (1-indexed)
-        max_tokens: Maximum tokens to generate (default: step-specific)
-        temperature: Sampling temperature
-        is_warmup: Whether this is a warmup call (for treatment)
-    
-    Returns:
-        Tuple of (output_bytes, metrics_dict)
-    """
-    global _llm
-    
-    _ensure_model_loaded()
-    
+def _prepare_prompt(prompt: str) -> str:
+    """Apply profile prefix and stop-marker instruction to a pre-built prompt."""
     # Prepend shared prefix for prefill-dominant profile
     if BENCH_PROFILE == "prefill_dominant":
         prompt = get_shared_prefix() + prompt
     
     # Apply bounded prompt (adds stop marker instruction)
-    prompt = ensure_bounded_prompt(prompt)
-    
-    # Use step-specific max tokens if not explicitly set
-    if max_tokens is None:
-        max_tokens = get_step_max_tokens(step_name)
-    
-    if torch.cuda.is_available():
-        torch.cuda.synchronize()
-    start_time = time.time()
-    
-    # Use step-specific max tokens AND stop sequences
-    sampling_params = SamplingParams(
-        temperature=temperature, 
-        max_tokens=max_tokens, 
-        top_p=0.9,
-        stop=STOP_SEQUENCES
-    )
-    
-    # Generate with streaming to capture TTFT
-    # vLLM doesn't expose TTFT directly, so we use non-streaming and estimate
-    outputs = _llm.generate([prompt], sampling_params, use_tqdm=False)
-    
-    if torch.cuda.is_available():
-        torch.cuda.synchronize()
-    end_time = time.time()
-    
-    total_latency_ms = (end_time - start_time) * 1000
-    
-    if outputs and outputs[0].outputs:
-        output = outputs[0].outputs[0]
+    return ensure_bounded_prompt(prompt)
+
+
+def _build_result(
+    prompt: str,
+    request_output: Any,
+    total_latency_ms: float,
+    power_w: float,
+    step_name: str,
+    flow_idx: int
+) -> Tuple[bytes, Dict[str, Any]]:
+    """Turn one vLLM RequestOutput into (output_bytes, metrics_dict) and log it."""
+    if request_output is not None and request_output.outputs:
+        output = request_output.outputs[0]
         generated_text = output.text
         # Strip stop marker if present (some engines include it)
         if STOP_MARKER in generated_text:
@@ -292,7 +261,6 @@ def run_prompt(
         decode_tokens = 0
     
     prompt_tokens = _count_tokens(prompt)
-    power_w = _get_gpu_power_watts()
     
     # TTFT-based prefill/decode estimation
     # Prefill time ≈ time proportional to prompt_tokens
@@ -312,11 +280,17 @@ def run_prompt(
     
     energy_j = power_w * (total_latency_ms / 1000.0)
     
-    # Baseline: prefill_tokens_computed = prompt_tokens (no reuse)
-    # For treatment: the LE-0 wheel would return actual reused_tokens if available
-    # Since we are the baseline target, we set reused_tokens to None to indicate "not available"
-    prefill_tokens_computed = prompt_tokens
-    reused_tokens = None  # N/A - wheel does not expose this metric
+    # With PREFIX_CACHING on, every run (baseline included) may serve part of
+    # the prompt from the KV cache; vLLM reports that count per request as
+    # num_cached_tokens. With it off nothing is reused. If caching is on but
+    # the engine does not report the count, reused_tokens is None ("N/A") and
+    # prefill_tokens_computed is an upper bound.
+    if PREFIX_CACHING:
+        cached = getattr(request_output, "num_cached_tokens", None)
+        reused_tokens = min(cached, prompt_tokens) if isinstance(cached, int) else None
+    else:
+        reused_tokens = 0
+    prefill_tokens_computed = prompt_tokens - (reused_tokens or 0)
     
     # Log metrics with prefill/decode breakdown (IP-safe: no text output)
     reused_str = "N/A" if reused_tokens is None else str(reused_tokens)
@@ -340,21 +314,135 @@ def run_prompt(
         "prefill_ms": prefill_ms,
         "decode_ms": decode_ms,
         "prefill_tokens_computed": prefill_tokens_computed,
-        "reused_tokens": reused_tokens,  # None = not available from wheel
+        "reused_tokens": reused_tokens,  # None = not reported by the engine
+        "prefix_caching": PREFIX_CACHING,
         "power_w": power_w,
         "energy_j": energy_j,
     }
+    return output_bytes, metrics
+
+
+def _timed_generate(prompts: List[str], sampling_params: "SamplingParams") -> Tuple[List[Any], float]:
+    """Run one synchronized generate call. Returns (outputs, latency_ms)."""
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start_time = time.time()
+    
+    # Generate with streaming to capture TTFT
+    # vLLM doesn't expose TTFT directly, so we use non-streaming and estimate
+    outputs = _llm.generate(prompts, sampling_params, use_tqdm=False)
+    
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    end_time = time.time()
+    
+    return outputs, (end_time - start_time) * 1000
+
+
+def run_prompt(
+    prompt: str,
+    step_name: str,
+    flow_idx: int = 1,
+    max_tokens: int = None,
+    temperature: float = 0.7,
+    is_warmup: bool = False
+) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Run vLLM generation with TTFT-based prefill/decode timing breakdown.
+    
+    Args:
+        prompt: Pre-built prompt string
+        step_name: Name of step for logging
+        flow_idx: Flow index for logging (1-indexed)
+        max_tokens: Maximum tokens to generate (default: step-specific)
+        temperature: Sampling temperature
+        is_warmup: Whether this is a warmup call (for treatment)
+    
+    Returns:
+        Tuple of (output_bytes, metrics_dict)
+    """
+    _ensure_model_loaded()
+    
+    prompt = _prepare_prompt(prompt)
+    
+    # Use step-specific max tokens if not explicitly set
+    if max_tokens is None:
+        max_tokens = get_step_max_tokens(step_name)
+    
+    # Use step-specific max tokens AND stop sequences
+    sampling_params = SamplingParams(
+        temperature=temperature, 
+        max_tokens=max_tokens, 
+        top_p=0.9,
+        stop=STOP_SEQUENCES
+    )
+    
+    outputs, total_latency_ms = _timed_generate([prompt], sampling_params)
+    output_bytes, metrics = _build_result(
+        prompt, outputs[0] if outputs else None, total_latency_ms,
+        _get_gpu_power_watts(), step_name, flow_idx
+    )
     
     # For warmup, generate an opaque context handle
     # This simulates what LE-0 would return - an opaque reference to retained context
     if is_warmup:
-        import hashlib
-        handle = f"ctx_{hashlib.sha256(prompt.encode()).hexdigest()[:12]}"
+        handle = f"ctx_{hashlib.sha256(prompt.encode(), usedforsecurity=False).hexdigest()[:12]}"
         metrics["context_handle"] = handle
     
     return output_bytes, metrics
 
 
+def run_prompts_batch(
+    prompts: List[str],
+    step_name: str,
+    flow_idxs: List[int],
+    max_tokens: int = None,
+    temperature: float = 0.7
+) -> List[Tuple[bytes, Dict[str, Any]]]:
+    """
+    Run several same-step prompts through one vLLM generate call.
+    
+    vLLM schedules the whole list together (continuous batching), so a wave
+    of independent prompts costs roughly one decode pass instead of N.
+    The batch wall time is split evenly across requests so per-request
+    latency/energy still sum to what was actually spent.
+    
+    Args:
+        prompts: Pre-built prompt strings
+        step_name: Name of step (shared by the whole batch)
+        flow_idxs: Flow index per prompt for logging (1-indexed)
+        max_tokens: Maximum tokens to generate (default: step-specific)
+        temperature: Sampling temperature
+    
+    Returns:
+        List of (output_bytes, metrics_dict), in prompt order
+    """
+    if not prompts:
+        return []
+    
+    _ensure_model_loaded()
+    
+    prepared = [_prepare_prompt(p) for p in prompts]
+    if max_tokens is None:
+        max_tokens = get_step_max_tokens(step_name)
+    
+    sampling_params = SamplingParams(
+        temperature=temperature,
+        max_tokens=max_tokens,
+        top_p=0.9,
+        stop=STOP_SEQUENCES
+    )
+    
+    outputs, batch_latency_ms = _timed_generate(prepared, sampling_params)
+    share_ms = batch_latency_ms / len(prepared)
+    power_w = _get_gpu_power_watts()
+    
+    return [
+        _build_result(prompt, outputs[k] if k < len(outputs) else None, share_ms, power_w, step_name, flow_idx)
+        for k, (prompt, flow_idx) in enumerate(zip(prepared, flow_idxs))
+    ]
+
+
 def run(step_name: str, flow_idx: int = 0, mode: str = "baseline", **kwargs) -> Tuple[bytes, Dict[str, Any]]:
     """
     LE-0 v0.2.0 target contract.